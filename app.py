@@ -1,30 +1,52 @@
-import streamlit as st
 import pandas as pd
+import streamlit as st
+from functools import partial
 
-from utils.load_data import load_team_csvs, load_tournament_csvs
+from utils.dataset import (
+    get_lineups, get_memory_report, get_pass_network, get_player_pass_cube, get_possession_indexes, get_season_games,
+    get_team_data, get_throw_outcome_counts, get_zone_stats, select_games, select_table,
+    check_shared_data, get_bundle_manifest, get_ingest_log, get_load_errors, start_ingest, start_prewarm,
+)
+from utils.bundle import BUNDLE_ENV_VAR, active_bundle, requested_bundle
+from utils.ingest import QUARANTINE_DIR, drop_dir
+from utils.duckdb_backend import BACKEND_ENV_VAR, active_backend, requested_backend
+from utils.perf import finish_perf_run, perf_phase, set_perf_view, start_perf_run
 
-from views.points import show_points
-from views.possessions import show_possessions
-from views.passes import show_passes
-from views.player_stats import show_player_stats
 
+# Sessions share the process-wide season frames; copy-on-write lets views slice them without copying and
+# keeps any write a view makes on its own copy
+pd.set_option('mode.copy_on_write', True)
 
 DATA_DIR = 'data'
-SUBVIEWS = ["Passes", "Points", "Possessions", "Player Stats", "Defensive Blocks"]
+SUBVIEWS = ["Passes", "Pass Network", "Field Zones", "Points", "Possessions", "Player Stats", "Defensive Blocks"]
+# Season table shown under "View All Data" for subviews that are not named after one
+SUBVIEW_TABLES = {"Pass Network": "Passes", "Field Zones": "Passes"}
 
 
-# Load data
-team_data = load_team_csvs(DATA_DIR)
-tournament_data = load_tournament_csvs(DATA_DIR)
-tournaments = list(tournament_data.keys())
+# End the rerun early, logging its timing and checking shared data first (see the end of the script)
+def stop_run():
+    finish_perf_run()
+    check_shared_data(DATA_DIR)
+    st.stop()
+
 
 st.set_page_config(layout="wide")
 
+# Opt-in timing of this rerun (?perf=1 or APP_PERF=1)
+start_perf_run()
+
+# Optionally start loading the dataset in the background (APP_PREWARM=1) while the login form is shown, and
+# the worker that ingests exports dropped into APP_DROP_DIR
+start_prewarm(DATA_DIR)
+start_ingest(DATA_DIR)
+
 # --- Simple Login ---
+# Shown before any data is loaded, so the first paint does not wait for the dataset
 if 'logged_in' not in st.session_state:
     st.session_state.logged_in = False
 
 if not st.session_state.logged_in:
+    set_perf_view('Login')
     st.title('Login Required')
     username = st.text_input('Username')
     password = st.text_input('Password', type='password')
@@ -36,50 +58,114 @@ if not st.session_state.logged_in:
             st.rerun()
         else:
             st.error('Invalid username or password.')
-    st.stop()
+    stop_run()
+
+# Load data
+with perf_phase('load team data'):
+    team_data = get_team_data(DATA_DIR)
+with perf_phase('load tournament data'):
+    season_games = get_season_games(DATA_DIR)
+tournaments = list(season_games)
 
 # Sidebar for data selection
 data_type = st.sidebar.radio('View', ['Tournaments', 'Team Data'])
 
 # Display data based on selection
 st.header(data_type)
+set_perf_view(data_type)
 if data_type == 'Team Data':
     for fname, data in team_data.items():
         st.subheader(fname)
         st.dataframe(data)
 elif data_type == 'Tournaments':
-    # Create subview data based on selected tournaments and games
-    subview_data = dict.fromkeys(SUBVIEWS)
+    # Collect the selected (tournament, game) pairs; subview data is sliced from the season frames
+    selected_games = []
     selected_tournaments = st.sidebar.multiselect('Tournaments', tournaments, default=tournaments)
     for tournament in selected_tournaments:
-        games = list(tournament_data[tournament].keys())
-        selected_games = st.sidebar.multiselect(tournament, games, default=games)
-        for game in selected_games:
-            for subview_name in SUBVIEWS:
-                old_subview_data = subview_data[subview_name]
-                new_subview_data = tournament_data[tournament][game][subview_name]
-                subview_data[subview_name] = pd.concat([old_subview_data, new_subview_data])
-
-    # Display selected subview
+        games = season_games[tournament]
+        selected = st.sidebar.multiselect(tournament, games, default=games)
+        selected_games.extend((tournament, game) for game in selected)
+
+    if requested_backend() != active_backend():
+        st.sidebar.warning(f"{BACKEND_ENV_VAR}={requested_backend()} needs the duckdb package; using pandas.")
+    if requested_bundle() and not active_bundle():
+        st.sidebar.warning(f"{BUNDLE_ENV_VAR}={requested_bundle()} is not a built season bundle or pyarrow is missing; reading {DATA_DIR}/.")
+
+    # Display selected subview; each view module (and Plotly with it) is imported when first shown
     subview = st.sidebar.radio("Subview", SUBVIEWS[:-1])
+    set_perf_view(subview)
+    if not selected_games:
+        st.info("No data available for selected games")
+        stop_run()
+
     if subview == "Passes":
-        df = subview_data[subview]
-        show_passes(df)
+        from views.passes import show_passes
+        show_passes(partial(select_table, DATA_DIR, "Passes", selected_games))
+    elif subview == "Pass Network":
+        from views.pass_network import show_pass_network
+        with perf_phase('pass network'):
+            connections = get_pass_network(DATA_DIR, selected_games)
+        show_pass_network(connections)
+    elif subview == "Field Zones":
+        from views.field_zones import show_field_zones
+        with perf_phase('filter options'):
+            options = select_table(DATA_DIR, "Passes", selected_games, columns=['Thrower', 'Receiver'])
+        show_field_zones(selected_games, options, partial(get_zone_stats, DATA_DIR))
     elif subview == "Points":
-        df = subview_data[subview]
-        show_points(df)
+        from views.points import show_points
+        with perf_phase('select games'):
+            df = select_table(DATA_DIR, "Points", selected_games)
+        with perf_phase('point outcomes', rows=len(df)):
+            show_points(df)
     elif subview == "Possessions":
-        df = subview_data[subview]
-        passes_df = subview_data["Passes"]
-        if passes_df is not None:
-            show_possessions(passes_df)
+        from views.possessions import show_possessions
+        with perf_phase('possession indexes'):
+            possession_indexes = get_possession_indexes(DATA_DIR)
+            games = [f"{tournament}_{game}" for tournament, game in selected_games]
+            selected_indexes = {game: possession_indexes[game] for game in games if game in possession_indexes}
+        if selected_indexes:
+            show_possessions(selected_indexes)
         else:
             st.info("No passes data available for selected games")
     elif subview == "Player Stats":
-        pass_df = subview_data["Passes"]
-        df = subview_data["Player Stats"]
-        show_player_stats(pass_df, df)
+        from views.player_stats import show_player_stats
+        with perf_phase('select games'):
+            df = select_table(DATA_DIR, "Player Stats", selected_games)
+            throw_counts = select_games(get_throw_outcome_counts(DATA_DIR), selected_games)
+            player_cube = select_games(get_player_pass_cube(DATA_DIR), selected_games)
+            lineups = get_lineups(DATA_DIR, selected_games)
+        show_player_stats(df, throw_counts, player_cube, lineups)
+
+    with st.sidebar.expander("Dataset memory"):
+        st.caption(f"Query backend: {active_backend()}")
+        bundle_manifest = get_bundle_manifest(DATA_DIR)
+        if bundle_manifest:
+            st.caption(f"Season bundle: {active_bundle()} (built {bundle_manifest['created']})")
+        memory = get_memory_report(DATA_DIR)
+        if memory is not None:
+            st.dataframe(memory, hide_index=True)
+
+    if drop_dir() and not active_bundle():
+        with st.sidebar.expander("Drop folder"):
+            ingest_log = pd.DataFrame(get_ingest_log(DATA_DIR), columns=['time', 'export', 'status', 'detail'])
+            counts = ingest_log['status'].value_counts()
+            st.caption(
+                f"Watching {drop_dir()}: {counts.get('ingested', 0)} ingested, {counts.get('quarantined', 0)} "
+                f"quarantined (see {QUARANTINE_DIR}/)"
+            )
+            if not ingest_log.empty:
+                st.dataframe(ingest_log[::-1], hide_index=True)
+
+    load_errors = get_load_errors(DATA_DIR)
+    if load_errors:
+        with st.sidebar.expander(f"Load errors ({len(load_errors)})"):
+            st.caption(f"Files in {DATA_DIR}/ that could not be parsed; they are left out until fixed.")
+            st.dataframe(pd.DataFrame(load_errors), hide_index=True)
 
     show_data = st.checkbox('View All Data', value=False)
     if show_data:
-        st.dataframe(df)
\ No newline at end of file
+        with perf_phase('all data table'):
+            st.dataframe(select_table(DATA_DIR, SUBVIEW_TABLES.get(subview, subview), selected_games))
+
+finish_perf_run()
+check_shared_data(DATA_DIR)
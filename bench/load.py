@@ -0,0 +1,231 @@
+# Headless load test: N simulated users drive app.py concurrently through Streamlit's AppTest, each replaying a
+# scripted flow (login, pick tournaments and games, switch subviews, pick throwers, toggle possessions).
+# Reports p50/p95/p99 rerun latency and peak process RSS per view.
+#
+#   python -m bench.load --users 25                  # against the real data/ tree
+#   python -m bench.load --users 25 --games 100      # against a synthetic season (bench/synthetic.py)
+#
+# All users share one process, as sessions do in `streamlit run`, so the process-wide dataset store, its locks
+# and the GIL are exercised the same way. APP_GUARD_SHARED=1 is set so a view writing to shared data fails the run.
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import resource
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+from bench.run import git_commit
+from bench.synthetic import generate
+from utils.dataset import GUARD_ENV_VAR
+
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+SUBVIEWS = ["Passes", "Pass Network", "Field Zones", "Points", "Possessions", "Player Stats"]
+PERCENTILES = [50, 95, 99]
+RSS_INTERVAL = 0.05   # seconds between RSS samples
+CREDENTIALS = ('bench', 'bench')
+
+
+# Resident set size of this process in bytes; falls back to the peak so far where /proc is unavailable
+def current_rss():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if platform.system() == 'Darwin' else peak * 1024
+
+# Collects rerun timings and samples RSS in the background; the peak is attributed to every view being rerun
+# at the time of the sample
+class LoadRecorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reruns = []
+        self.active = {}
+        self.peak_rss = {}
+        self.stopped = threading.Event()
+        self.sampler = threading.Thread(target=self.sample, daemon=True)
+
+    def sample(self):
+        while not self.stopped.wait(RSS_INTERVAL):
+            rss = current_rss()
+            with self.lock:
+                for view in set(self.active.values()):
+                    self.peak_rss[view] = max(self.peak_rss.get(view, 0), rss)
+
+    # Run one rerun of `at` and record it under `view`
+    def rerun(self, user, view, at):
+        with self.lock:
+            self.active[user] = view
+        start = time.perf_counter()
+        try:
+            at.run()
+        finally:
+            seconds = time.perf_counter() - start
+            rss = current_rss()
+            with self.lock:
+                del self.active[user]
+                self.peak_rss[view] = max(self.peak_rss.get(view, 0), rss)
+                self.reruns.append({'user': user, 'view': view, 'seconds': seconds, 'errors': [str(e.value) for e in at.exception]})
+        return at
+
+    def summary(self):
+        df = pd.DataFrame(self.reruns)
+        rows = []
+        for view, group in df.groupby('view'):
+            seconds = group['seconds'].to_numpy()
+            rows.append({
+                'view': view,
+                'reruns': len(group),
+                **{f"p{p}_s": round(float(np.percentile(seconds, p)), 4) for p in PERCENTILES},
+                'max_s': round(float(seconds.max()), 4),
+                'peak_rss_mb': round(self.peak_rss.get(view, 0) / 2 ** 20, 1),
+                'errors': int((group['errors'].str.len() > 0).sum()),
+            })
+        return rows
+
+def widget(elements, label):
+    return next(element for element in elements if element.label == label)
+
+# One simulated user: log in, narrow the tournament and game selection, then visit the subviews in a random
+# order with a few view-specific interactions each
+def user_flow(user, recorder, rng, rounds, start_barrier):
+    at = AppTest.from_file(APP_PATH, default_timeout=600)
+    at.secrets['username'], at.secrets['password'] = CREDENTIALS
+    start_barrier.wait()
+    recorder.rerun(user, 'login page', at)
+    at.text_input[0].input(CREDENTIALS[0])
+    at.text_input[1].input(CREDENTIALS[1])
+    at.button[0].click()
+    recorder.rerun(user, 'login', at)
+
+    tournaments = widget(at.multiselect, 'Tournaments').options
+    chosen = rng.sample(tournaments, rng.randint(1, len(tournaments)))
+    widget(at.multiselect, 'Tournaments').set_value(chosen)
+    recorder.rerun(user, 'select tournaments', at)
+    for tournament in chosen:
+        games = widget(at.multiselect, tournament).options
+        if len(games) > 1 and rng.random() < 0.5:
+            widget(at.multiselect, tournament).set_value(rng.sample(games, rng.randint(1, len(games))))
+            recorder.rerun(user, 'select games', at)
+
+    for _ in range(rounds):
+        for subview in rng.sample(SUBVIEWS, len(SUBVIEWS)):
+            widget(at.radio, 'Subview').set_value(subview)
+            recorder.rerun(user, subview, at)
+            interact(user, recorder, rng, at, subview)
+    return at
+
+# View-specific interactions, each one rerun recorded under "<subview>: <action>"
+def interact(user, recorder, rng, at, subview):
+    if subview == "Passes":
+        throwers = widget(at.selectbox, 'Thrower').options
+        if throwers:
+            widget(at.selectbox, 'Thrower').set_value(rng.choice(throwers))
+            recorder.rerun(user, 'Passes: pick thrower', at)
+            widget(at.checkbox, 'Differentiate Possessions').check()
+            recorder.rerun(user, 'Passes: differentiate possessions', at)
+            widget(at.selectbox, 'Thrower').set_value(None)
+            widget(at.checkbox, 'Differentiate Possessions').uncheck()
+            recorder.rerun(user, 'Passes: clear thrower', at)
+    elif subview == "Possessions":
+        checkboxes = [checkbox for checkbox in at.checkbox if checkbox.label.strip().startswith('Possession')]
+        for checkbox in rng.sample(checkboxes, min(3, len(checkboxes))):
+            checkbox.set_value(not checkbox.value)
+            recorder.rerun(user, 'Possessions: toggle possession', at)
+    elif subview == "Field Zones":
+        widget(at.radio, 'Zone by').set_value(rng.choice(["Throw start", "Throw end"]))
+        recorder.rerun(user, 'Field Zones: zone by', at)
+    elif subview == "Pass Network":
+        slider = widget(at.slider, 'Minimum attempts')
+        slider.set_value(rng.randint(slider.min, slider.max))
+        recorder.rerun(user, 'Pass Network: minimum attempts', at)
+
+# Replay the flows of `users` simulated users at once; returns the recorder, wall time and any failed flows
+def run_load(users, rounds, seed):
+    recorder = LoadRecorder()
+    start_barrier = threading.Barrier(users)
+    failures = []
+
+    def run_user(user):
+        try:
+            user_flow(user, recorder, random.Random(seed + user), rounds, start_barrier)
+        except Exception as e:
+            failures.append(f"user {user}: {type(e).__name__}: {e}")
+
+    recorder.sampler.start()
+    start = time.perf_counter()
+    threads = [threading.Thread(target=run_user, args=(user,)) for user in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    recorder.stopped.set()
+    return recorder, elapsed, failures
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay scripted user flows against app.py with concurrent headless sessions.')
+    parser.add_argument('--users', type=int, default=25, help='simulated concurrent users')
+    parser.add_argument('--rounds', type=int, default=1, help='passes over all subviews per user')
+    parser.add_argument('--games', type=int, default=None, help='run against a synthetic season of this many games instead of data/')
+    parser.add_argument('--data', default='bench_data', help='where synthetic seasons are generated (reused if present)')
+    parser.add_argument('--output', default='load_results.json')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    # Widgets are read from the user threads outside a script run; silence the "missing ScriptRunContext" warnings
+    logging.disable(logging.WARNING)
+
+    output = os.path.abspath(args.output)
+    if args.games:
+        # app.py reads ./data, so run from the synthetic season's directory
+        out_dir = os.path.join(args.data, f"{args.games}_games")
+        if not os.path.isdir(os.path.join(out_dir, 'data')):
+            generate(args.games, out_dir, seed=args.seed)
+        os.chdir(out_dir)
+    os.environ[GUARD_ENV_VAR] = '1'
+
+    recorder, elapsed, failures = run_load(args.users, args.rounds, args.seed)
+    summary = recorder.summary()
+
+    print(f"{args.users} users, {len(recorder.reruns)} reruns in {elapsed:.1f} s")
+    print(f"{'view':<36} {'reruns':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'RSS MB':>8} {'errors':>6}")
+    for row in summary:
+        print(
+            f"{row['view']:<36} {row['reruns']:>6} {row['p50_s'] * 1000:>9.1f} {row['p95_s'] * 1000:>9.1f} "
+            f"{row['p99_s'] * 1000:>9.1f} {row['max_s'] * 1000:>9.1f} {row['peak_rss_mb']:>8.1f} {row['errors']:>6}"
+        )
+    for failure in failures:
+        print(failure)
+
+    report = {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'users': args.users,
+        'rounds': args.rounds,
+        'games': args.games,
+        'elapsed_s': round(elapsed, 3),
+        'failures': failures,
+        'summary': summary,
+        'reruns': recorder.reruns,
+    }
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=1)
+    print(f"wrote {output}")
+    if failures or any(row['errors'] for row in summary):
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
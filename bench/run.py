@@ -0,0 +1,232 @@
+# Headless benchmark suite: generates synthetic seasons (bench/synthetic.py) and times loading (CSV, .statto and
+# season bundle), subview assembly, pandas vs DuckDB table queries, the Player Stats / Points stats functions and
+# Plotly figure building for each view.
+#
+#   python -m bench.run --sizes 10 100 1000 --output bench_results.json
+#
+# Results are written as JSON (one row per benchmark with min/median seconds) so runs can be diffed.
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import plotly
+
+from bench.synthetic import generate
+from utils import duckdb_backend
+from utils.bundle import pyarrow_available, read_bundle, write_bundle
+from utils.dataset import build_season_frames, dataset_version, select_games, select_rows
+from utils.draw import add_throws, draw_field, error_throw_styles, outcome_throw_styles
+from utils.endzone import endzone_attempts
+from utils.lineups import build_lineup_incidence, player_on_off, select_lineup_incidence, top_lineup_combinations
+from utils.load_data import load_tournament_csvs, tournament_manifest
+from utils.possessions import build_possession_indexes, select_possessions
+from utils.spatial import add_zone_chart, zone_stats
+from utils.statto import load_statto_archive
+from utils.stats import player_pass_cube, throw_outcome_counts, throwing_metrics
+from views import player_stats, points
+
+
+# Same pandas mode as the app, so selections are measured as the zero-copy slices sessions get
+pd.set_option('mode.copy_on_write', True)
+
+DEFAULT_SIZES = [10, 100, 1000]
+ZONE_MODES = ["Start density", "End density", "Flow", "Completion %"]
+
+
+# Run fn `repeat` times; returns (timings in seconds, last result)
+def timed(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return timings, result
+
+# Collects one result row per benchmark
+class Recorder:
+    def __init__(self, games, repeat):
+        self.games = games
+        self.repeat = repeat
+        self.rows = []
+
+    def measure(self, phase, name, fn, rows=None, repeat=None, **extra):
+        timings, result = timed(fn, repeat or self.repeat)
+        self.rows.append({
+            'games': self.games,
+            'phase': phase,
+            'name': name,
+            'rows': rows,
+            'min_s': round(min(timings), 6),
+            'median_s': round(statistics.median(timings), 6),
+            'runs': len(timings),
+            **extra,
+        })
+        print(f"{self.games:>6} {phase:<10} {name:<40} {min(timings) * 1000:>10.2f} ms")
+        return result
+
+# Plotly figure for each view, as built on a rerun
+def passes_figure(passes_df):
+    throws = outcome_throw_styles(passes_df, hover_columns=(("Thrower", "Thrower"), ("Receiver", "Receiver"), ("Point", "Point")))
+    return add_throws(draw_field(), throws)
+
+def endzone_figure(passes_df):
+    attempt_throws, _ = endzone_attempts(passes_df)
+    return add_throws(draw_field(), error_throw_styles(attempt_throws), arrows=True, outline=False)
+
+def possessions_figure(game_df):
+    throws = outcome_throw_styles(game_df, line_color=pd.Series("green", index=game_df.index))
+    return add_throws(draw_field(), throws)
+
+def zone_figure(passes_df, mode):
+    return add_zone_chart(draw_field(), passes_df, mode)
+
+# Table queries as the views issue them, on the pandas path and, when duckdb is installed, on a database file
+# next to the generated data (first run includes writing the tables). version and games are what the app passes
+# to sync_tables() for the same data, so the timed sync writes the same tables.
+def bench_queries(rec, season_frames, version, games, all_games, first_tournament, db_path):
+    passes = season_frames['Passes']
+    first_pass = passes.iloc[0]
+    queries = {
+        'Passes (all)': ('Passes', all_games, None, None),
+        'Passes (1 tournament)': ('Passes', first_tournament, None, None),
+        'Passes filter options': ('Passes', all_games, None, ['Thrower', 'Receiver', 'Point']),
+        'Passes (thrower + point)': ('Passes', all_games, {'Thrower': first_pass['Thrower'], 'Point': first_pass['Point']}, None),
+        'Player Stats (all)': ('Player Stats', all_games, None, None),
+    }
+    backends = {'pandas': lambda name, games, filters, columns: select_rows(season_frames[name], games, filters, columns)}
+    if duckdb_backend.duckdb_available():
+        if os.path.exists(db_path):
+            os.remove(db_path)
+        con = duckdb_backend.connect(db_path)
+        rec.measure('query', 'duckdb sync_tables', lambda: duckdb_backend.sync_tables(con, season_frames, version, games), repeat=1, backend='duckdb')
+        backends['duckdb'] = lambda name, games, filters, columns: duckdb_backend.query_table(con, name, games, filters, columns)
+    for backend, query in backends.items():
+        for label, (name, games, filters, columns) in queries.items():
+            rec.measure('query', f"{backend} {label}", lambda: query(name, games, filters, columns), rows=len(season_frames[name]), backend=backend)
+
+# Load, subview assembly, stats and figure benchmarks for one generated season
+def bench_season(paths, games, repeat):
+    rec = Recorder(games, repeat)
+
+    tournament_data = rec.measure('load', 'load_tournament_csvs', lambda: load_tournament_csvs(paths['csv']))
+    rec.measure('load', 'load_statto_archive', lambda: load_statto_archive(paths['statto']))
+    season_frames = rec.measure('load', 'build_season_frames', lambda: build_season_frames(tournament_data))
+    # Version and display order of the games as the app derives them for the generated game folders
+    version = dataset_version(tournament_manifest(paths['csv']), {})
+    season_games = [(tournament, game) for tournament, games in tournament_data.items() for game in games]
+    if pyarrow_available():
+        bundle_dir = os.path.join(os.path.dirname(paths['csv']), 'season_bundle')
+        rec.measure('load', 'write_bundle', lambda: write_bundle(bundle_dir, season_frames, season_games, version, []))
+        rec.measure('load', 'read_bundle', lambda: read_bundle(bundle_dir))
+
+    all_games = list(season_frames['Passes'].index.unique())
+    first_tournament = [game for game in all_games if game[0] == all_games[0][0]]
+    for subview in ["Passes", "Points", "Possessions", "Player Stats"]:
+        frame = season_frames[subview]
+        rec.measure('assembly', f"select_games {subview} (all)", lambda: select_games(frame, all_games), rows=len(frame))
+        rec.measure('assembly', f"select_games {subview} (1 tournament)", lambda: select_games(frame, first_tournament), rows=len(frame))
+
+    bench_queries(rec, season_frames, version, season_games, all_games, first_tournament, os.path.join(os.path.dirname(paths['csv']), 'season.duckdb'))
+
+    passes_df = select_games(season_frames['Passes'], all_games)
+    points_df = select_games(season_frames['Points'], all_games)
+    player_stats_df = select_games(season_frames['Player Stats'], all_games)
+    num_passes = len(passes_df)
+
+    grouped = rec.measure('stats', 'group_player_stats_df', lambda: player_stats.group_player_stats_df(player_stats_df), rows=len(player_stats_df))
+    rec.measure('stats', 'create_involvement_df', lambda: player_stats.create_involvement_df(grouped), rows=len(grouped))
+    rec.measure('stats', 'create_throwing_df', lambda: player_stats.create_throwing_df(grouped), rows=len(grouped))
+    throw_counts = rec.measure('stats', 'throw_outcome_counts', lambda: throw_outcome_counts(passes_df, ['Started on offense?']), rows=num_passes)
+    rec.measure('stats', 'throwing_metrics (team)', lambda: throwing_metrics(throw_counts), rows=len(throw_counts))
+    season_cube = rec.measure('stats', 'player_pass_cube', lambda: player_pass_cube(season_frames['Passes']), rows=num_passes)
+    player_cube = rec.measure('assembly', 'select_games player cube (all)', lambda: select_games(season_cube, all_games), rows=len(season_cube))
+    rec.measure('stats', 'create_advanced_throwing_df', lambda: player_stats.create_advanced_throwing_df(grouped, player_cube), rows=len(player_cube))
+    rec.measure('stats', 'create_line_throwing_df', lambda: player_stats.create_line_throwing_df(throw_counts), rows=len(throw_counts))
+    rec.measure('stats', 'create_receiving_df', lambda: player_stats.create_receiving_df(grouped, player_cube), rows=len(player_cube))
+    rec.measure('stats', 'show_team_throwing_stats', lambda: player_stats.show_team_throwing_stats(throw_counts), rows=len(throw_counts))
+    rec.measure('stats', 'show_points', lambda: points.show_points(points_df), rows=len(points_df))
+    rec.measure('stats', 'endzone_attempts', lambda: endzone_attempts(passes_df), rows=num_passes)
+    incidence = rec.measure('stats', 'build_lineup_incidence', lambda: build_lineup_incidence(season_frames['Player Stats'], season_frames['Points']), rows=len(season_frames['Points']))
+    lineups = rec.measure('assembly', 'select_lineup_incidence (all)', lambda: select_lineup_incidence(incidence, all_games), rows=len(season_frames['Points']))
+    rec.measure('stats', 'player_on_off', lambda: player_on_off(lineups), rows=len(season_frames['Points']))
+    for size in (2, 3):
+        rec.measure('stats', f"top_lineup_combinations ({size})", lambda: top_lineup_combinations(lineups, size, min_points=5), rows=len(season_frames['Points']))
+    rec.measure('stats', 'zone_stats (5 yd)', lambda: zone_stats(passes_df), rows=num_passes)
+    rec.measure('stats', 'zone_stats (2 yd, end)', lambda: zone_stats(passes_df, 2, 'end'), rows=num_passes)
+    possession_indexes = rec.measure('stats', 'build_possession_indexes', lambda: build_possession_indexes(passes_df), rows=num_passes)
+
+    game_df, possessions = next(iter(possession_indexes.values()))
+    selected = list(possessions.index[:5])
+    rec.measure('stats', 'select_possessions (5)', lambda: select_possessions(game_df, possessions, selected), rows=len(game_df))
+
+    figures = {
+        'passes throws': (lambda: passes_figure(passes_df), num_passes),
+        'endzone throws': (lambda: endzone_figure(passes_df), num_passes),
+        'possessions throws (1 game)': (lambda: possessions_figure(game_df), len(game_df)),
+    }
+    for mode in ZONE_MODES:
+        figures[f"passes {mode}"] = ((lambda mode=mode: zone_figure(passes_df, mode)), num_passes)
+    for name, (build, rows) in figures.items():
+        fig = rec.measure('figure', name, build, rows=rows)
+        rec.rows[-1]['traces'] = len(fig.data)
+        figure_json = rec.measure('serialize', name, fig.to_json, rows=rows)
+        rec.rows[-1]['json_bytes'] = len(figure_json)
+    return rec.rows
+
+# Commit of the working tree being benchmarked, if it is a git checkout
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark loading, subview assembly, stats and figure building on synthetic seasons.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='number of games per synthetic season')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per benchmark; min and median are reported')
+    parser.add_argument('--data', default='bench_data', help='where synthetic seasons are generated (reused if present)')
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    # Views call st.* outside a Streamlit run; silence the "missing ScriptRunContext" warnings
+    logging.disable(logging.WARNING)
+
+    results = []
+    for games in args.sizes:
+        out_dir = os.path.join(args.data, f"{games}_games")
+        archive_path = os.path.join(out_dir, f"synthetic_{games}.statto")
+        data_dir = os.path.join(out_dir, 'data')
+        if os.path.exists(archive_path) and os.path.isdir(data_dir):
+            paths = {'statto': archive_path, 'csv': data_dir}
+        else:
+            start = time.perf_counter()
+            paths = generate(games, out_dir, seed=args.seed)
+            print(f"generated {games} games in {time.perf_counter() - start:.1f} s")
+        results.extend(bench_season(paths, games, args.repeat))
+
+    report = {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'plotly': plotly.__version__,
+        'repeat': args.repeat,
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=1)
+    print(f"wrote {len(results)} results to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+# Cold-start benchmark: time to first paint of app.py in a fresh process (the login screen), the first logged-in
+# render after it, and which view modules were imported before login. Each run is a new Python process, so
+# imports and the dataset store start cold.
+#
+#   python -m bench.startup --runs 5
+#   python -m bench.startup --runs 5 --typing 3      # user takes 3 s to log in (lets APP_PREWARM=1 work)
+#   python -m bench.startup --runs 5 --games 100     # against a synthetic season (bench/synthetic.py)
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from bench.synthetic import generate
+
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+CREDENTIALS = ('bench', 'bench')
+
+
+# One cold start, run in this process; prints a JSON line
+def measure(typing):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=600)
+    at.secrets['username'], at.secrets['password'] = CREDENTIALS
+    start = time.perf_counter()
+    at.run()
+    first_paint = time.perf_counter() - start
+    views_at_login = sorted(module for module in sys.modules if module.startswith('views.'))
+
+    time.sleep(typing)
+    at.text_input[0].input(CREDENTIALS[0])
+    at.text_input[1].input(CREDENTIALS[1])
+    at.button[0].click()
+    start = time.perf_counter()
+    at.run()
+    first_view = time.perf_counter() - start
+    print(json.dumps({
+        'first_paint_s': first_paint,
+        'first_view_s': first_view,
+        'views_at_login': views_at_login,
+        'errors': [str(e.value) for e in at.exception],
+    }))
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure cold-start time to first paint of app.py.')
+    parser.add_argument('--runs', type=int, default=5, help='fresh processes to start')
+    parser.add_argument('--typing', type=float, default=0.0, help='seconds between the login screen and logging in')
+    parser.add_argument('--games', type=int, default=None, help='run against a synthetic season of this many games instead of data/')
+    parser.add_argument('--data', default='bench_data', help='where synthetic seasons are generated (reused if present)')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        measure(args.typing)
+        return
+
+    # app.py reads ./data, so the children run from the synthetic season's directory
+    cwd = None
+    if args.games:
+        cwd = os.path.join(args.data, f"{args.games}_games")
+        if not os.path.isdir(os.path.join(cwd, 'data')):
+            generate(args.games, cwd)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [os.getcwd(), os.environ.get('PYTHONPATH')])))
+
+    runs = []
+    for _ in range(args.runs):
+        result = subprocess.run(
+            [sys.executable, '-W', 'ignore', '-m', 'bench.startup', '--child', '--typing', str(args.typing)],
+            capture_output=True, text=True, check=True, cwd=cwd, env=env,
+        )
+        runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+
+    for name in ['first_paint_s', 'first_view_s']:
+        values = [run[name] for run in runs]
+        print(f"{name:<15} median {statistics.median(values) * 1000:>8.1f} ms   min {min(values) * 1000:>8.1f} ms")
+    print(f"view modules imported before login: {sorted({module for run in runs for module in run['views_at_login']}) or 'none'}")
+    errors = [error for run in runs for error in run['errors']]
+    for error in errors:
+        print(error)
+    if errors:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
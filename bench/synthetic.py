@@ -0,0 +1,212 @@
+import argparse
+import json
+import os
+import uuid
+import zipfile
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from utils.statto import (
+    DEFENSIVE_BLOCKS_COLUMNS, PASSES_COLUMNS, PLAYER_STATS_COLUMNS, POINTS_COLUMNS, POSSESSIONS_COLUMNS,
+    STALL_OUTS_COLUMNS, load_statto_archive,
+)
+
+
+GAMES_PER_TOURNAMENT = 4
+POINTS_PER_GAME = 21
+ROSTER_SIZE = 24
+LINE_SIZE = 7
+MAX_PASSES_PER_POSSESSION = 25
+FIRST_NAMES = ['Alex', 'Sam', 'Jo', 'Kit', 'Robin', 'Casey', 'Drew', 'Morgan', 'Quinn', 'Riley', 'Avery', 'Jamie']
+LAST_NAMES = ['Shaw', 'Lang', 'Reyes', 'Okafor', 'Novak', 'Duffy', 'Marsh', 'Iqbal', 'Keane', 'Moss', 'Park', 'Hale']
+OPPONENTS = ['Flight', 'Starling', 'Vengeance', 'Dark Sky', 'Heist', 'Flipside', 'Nightlock', 'Lol', 'Comet', 'Riot']
+# Stat tables written per game folder, with the columns of the Statto CSV export
+CSV_TABLES = {
+    'Passes': PASSES_COLUMNS,
+    'Points': POINTS_COLUMNS,
+    'Possessions': POSSESSIONS_COLUMNS,
+    'Player Stats': PLAYER_STATS_COLUMNS,
+    'Defensive Blocks': DEFENSIVE_BLOCKS_COLUMNS,
+    'Stall Outs Against': STALL_OUTS_COLUMNS,
+}
+
+
+# Deterministic uuid strings so the same seed always produces the same archive
+def make_uuid(rng):
+    return str(uuid.UUID(bytes=rng.bytes(16), version=4)).upper()
+
+# Statto timestamp format
+def iso(moment):
+    return moment.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+# Simulates a season as the raw Statto relations (games, points, possessions, passes, blocks, ...).
+# Possessions walk the disc upfield with random turnovers, hucks and goals, so the derived tables
+# have realistic sizes (~20 points, ~25 possessions and ~130 passes per game) and flag rates.
+class SeasonSimulator:
+    def __init__(self, num_games, seed=0, team_name='Synthetic'):
+        self.rng = np.random.default_rng(seed)
+        self.num_games = num_games
+        self.team_uuid = make_uuid(self.rng)
+        self.team_name = team_name
+        self.clock = datetime(2025, 6, 1, 9, 0, tzinfo=timezone.utc)
+        self.relations = {name: [] for name in [
+            'games', 'points', 'possessions', 'passes', 'defensiveBlocks', 'players', 'groups',
+            'oppositionErrors', 'concededGoals', 'stallOutsAgainst',
+        ]}
+        self.players = []
+        for i in range(ROSTER_SIZE):
+            player_uuid = make_uuid(self.rng)
+            self.players.append(player_uuid)
+            self.relations['players'].append({
+                'uuid': player_uuid, 'createdAt': iso(self.clock), 'teamUUID': self.team_uuid,
+                'name': f"{FIRST_NAMES[i % len(FIRST_NAMES)]} {LAST_NAMES[(i * 5) % len(LAST_NAMES)]}",
+                'number': int(i * 3 % 100), 'nickname': {}, 'avatarData': {}, 'gender': 1, 'sortIndex': i,
+            })
+
+    # Advance the wall clock by a few seconds and return its timestamp
+    def tick(self, low=3, high=12):
+        self.clock += timedelta(seconds=int(self.rng.integers(low, high)))
+        return iso(self.clock)
+
+    def record(self, relation, **fields):
+        fields.setdefault('uuid', make_uuid(self.rng))
+        self.relations[relation].append(fields)
+        return fields['uuid']
+
+    # One of our possessions; returns 'scored', 'turnover' or 'stall'
+    def possession(self, point_uuid, line, x, y):
+        holder = line[self.rng.integers(len(line))]
+        possession_uuid = self.record('possessions', pointUUID=point_uuid, createdAt=self.tick(), startX=x, startY=y, initiatorUUID=holder)
+        last_pass = None
+        for _ in range(MAX_PASSES_PER_POSSESSION):
+            if self.rng.random() < 0.004:
+                break
+            receiver = line[self.rng.integers(len(line))]
+            while receiver == holder:
+                receiver = line[self.rng.integers(len(line))]
+            huck = self.rng.random() < 0.08
+            end_y = float(np.clip(y - (self.rng.normal(0.35, 0.1) if huck else self.rng.normal(0.045, 0.1)), 0.02, 0.98))
+            end_x = float(np.clip(x + 0.3 * (0.5 - x) + self.rng.normal(0, 0.18), 0.02, 0.98))
+            turnover = self.rng.random() < (0.25 if huck else 0.08)
+            thrower_error = turnover and self.rng.random() < 0.7
+            assist = not turnover and end_y < 0.18
+            this_pass = {
+                'possessionUUID': possession_uuid, 'createdAt': self.tick(), 'throwerUUID': holder,
+                'receiverUUID': receiver if not thrower_error else {}, 'startX': x, 'startY': y, 'endX': end_x, 'endY': end_y,
+                'isThrowerError': thrower_error, 'isReceiverError': turnover and not thrower_error,
+                'isAssist': assist, 'isSecondaryAssist': False,
+            }
+            self.record('passes', **this_pass)
+            if assist:
+                if last_pass is not None:
+                    last_pass['isSecondaryAssist'] = True
+                return 'scored'
+            if turnover:
+                return 'turnover'
+            last_pass = self.relations['passes'][-1]
+            holder, x, y = receiver, end_x, end_y
+        # Stalled out holding the disc
+        self.record('stallOutsAgainst', possessionUUID=possession_uuid, playerUUID=holder, createdAt=self.tick(), locationX=x, locationY=y)
+        return 'stall'
+
+    # Play one point; returns 1 if we scored and -1 if the opponent did
+    def point(self, game_uuid, offense):
+        line = list(self.rng.choice(self.players, LINE_SIZE, replace=False))
+        point = {'gameUUID': game_uuid, 'createdAt': self.tick(30, 90), 'isOffense': offense, 'playerUUIDs': line, 'result': 0}
+        point_uuid = self.record('points', **point)
+        point = self.relations['points'][-1]
+        our_disc = offense
+        x, y = float(self.rng.uniform(0.2, 0.8)), float(self.rng.uniform(0.8, 0.95))
+        while True:
+            if our_disc:
+                outcome = self.possession(point_uuid, line, x, y)
+                if outcome == 'scored':
+                    point['result'] = 1
+                    return 1
+                our_disc = False
+                continue
+            if self.rng.random() < 0.45:
+                self.record('concededGoals', pointUUID=point_uuid, createdAt=self.tick())
+                point['result'] = -1
+                return -1
+            x, y = float(self.rng.uniform(0.05, 0.95)), float(self.rng.uniform(0.3, 0.95))
+            if self.rng.random() < 0.5:
+                self.record(
+                    'defensiveBlocks', pointUUID=point_uuid, playerUUID=line[self.rng.integers(len(line))],
+                    createdAt=self.tick(), locationX=x, locationY=y, isStallOut=bool(self.rng.random() < 0.05),
+                    isCallahan=False,
+                )
+            else:
+                self.record('oppositionErrors', pointUUID=point_uuid, createdAt=self.tick())
+            our_disc = True
+
+    def season(self):
+        for i in range(self.num_games):
+            self.clock += timedelta(hours=3 if i % GAMES_PER_TOURNAMENT else 24 * 6)
+            game_uuid = self.record(
+                'games', createdAt=iso(self.clock), date=iso(self.clock), teamUUID=self.team_uuid,
+                opponent=f"{OPPONENTS[i % len(OPPONENTS)]} {i + 1:04d}", isFinished=True, playerLimit=LINE_SIZE,
+                result=0, windSpeed=0, pitchKind=0,
+            )
+            offense = bool(self.rng.random() < 0.5)
+            for _ in range(POINTS_PER_GAME):
+                offense = self.point(game_uuid, offense) == -1
+        return {
+            'team': {
+                'uuid': self.team_uuid, 'name': self.team_name, 'createdAt': iso(self.clock),
+                'minHuckDistance': 27, 'gender': 2, 'imageData': {},
+            },
+            'relations': self.relations,
+        }
+
+# Write season data as a .statto archive (zip with data.json)
+def write_statto_archive(season, path):
+    document = {
+        'filename': os.path.splitext(os.path.basename(path))[0],
+        'metadata': {'title': season['team']['name'], 'appVersion': 'synthetic'},
+        'teams': [{'uuid': season['team']['uuid'], 'data': season}],
+    }
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('data.json', json.dumps(document))
+        archive.writestr('app-version.txt', 'synthetic')
+    return path
+
+# Expand a .statto archive into data/<tournament>/<game>/ CSV folders in the Statto export layout,
+# GAMES_PER_TOURNAMENT games per tournament folder
+def write_csv_tree(archive_path, data_dir):
+    (_, games), = load_statto_archive(archive_path).items()
+    for i, (game, tables) in enumerate(games.items()):
+        tournament = f"t{i // GAMES_PER_TOURNAMENT + 1:03d}"
+        game_path = os.path.join(data_dir, tournament, f"g{i + 1:04d}")
+        os.makedirs(game_path, exist_ok=True)
+        date, opponent = game.split(' ', 1)
+        for name, columns in CSV_TABLES.items():
+            file_name = f"{name} vs. {opponent} {date}_12-00-00.csv"
+            tables[name][columns].to_csv(os.path.join(game_path, file_name), index=False)
+
+# Generate a synthetic season of num_games games under out_dir: a .statto archive and/or a CSV data tree.
+# Returns {'statto': archive path, 'csv': data dir} for the formats written.
+def generate(num_games, out_dir, formats=('csv', 'statto'), seed=0):
+    os.makedirs(out_dir, exist_ok=True)
+    season = SeasonSimulator(num_games, seed=seed, team_name=f"Synthetic {num_games}").season()
+    archive_path = write_statto_archive(season, os.path.join(out_dir, f"synthetic_{num_games}.statto"))
+    paths = {'statto': archive_path}
+    if 'csv' in formats:
+        data_dir = os.path.join(out_dir, 'data')
+        write_csv_tree(archive_path, data_dir)
+        paths['csv'] = data_dir
+    if 'statto' not in formats:
+        os.remove(archive_path)
+        del paths['statto']
+    return paths
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Write a synthetic season as Statto CSV folders and/or a .statto archive.')
+    parser.add_argument('--games', type=int, default=10)
+    parser.add_argument('--out', default='bench_data')
+    parser.add_argument('--formats', nargs='+', choices=['csv', 'statto'], default=['csv', 'statto'])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    print(generate(args.games, os.path.join(args.out, f"{args.games}_games"), args.formats, args.seed))
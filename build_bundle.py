@@ -0,0 +1,43 @@
+# Compile data/ (game folders and .statto archives) into a season bundle: one memory-mappable Arrow file per
+# stat table plus a manifest (see utils/bundle.py). Run it after adding a tournament, then point the app at it:
+#
+#   python build_bundle.py --data data --output season_bundle
+#   APP_BUNDLE=season_bundle streamlit run app.py
+#
+# The bundle is written to a new directory next to --output, which then becomes a symlink to it, so a running app
+# sees the previous bundle or the new one, never half of one or none.
+import argparse
+import logging
+import time
+
+from utils.bundle import write_bundle
+from utils.dataset import build_season_frames, load_tournament_data
+from utils.load_data import archive_manifest, tournament_manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile the tournament CSVs and .statto archives into a season bundle.')
+    parser.add_argument('--data', default='data', help='data directory read by the app')
+    parser.add_argument('--output', default='season_bundle', help='bundle path to write (a symlink to the newest bundle directory)')
+    args = parser.parse_args()
+
+    # Loading runs outside a Streamlit session; silence the "missing ScriptRunContext" warnings
+    logging.disable(logging.WARNING)
+
+    start = time.perf_counter()
+    tournament_data, version, load_errors = load_tournament_data(args.data)
+    for path, error in load_errors:
+        print(f"skipped {path}: {error}")
+    season_frames = build_season_frames(tournament_data)
+    games = [(tournament, game) for tournament, games in tournament_data.items() for game in games]
+    sources = sorted(path for game_manifest in tournament_manifest(args.data).values() for path in game_manifest)
+    sources += sorted(archive_manifest(args.data))
+    manifest = write_bundle(args.output, season_frames, games, version, sources)
+
+    for name, table in manifest['tables'].items():
+        print(f"{name:<24} {table['rows']:>8} rows {table['columns']:>4} columns")
+    print(f"wrote {len(games)} games from {len(sources)} files to {args.output} (version {version}) in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from utils.bundle import BUNDLE_ENV_VAR
+from utils.dataset import GUARD_ENV_VAR, _dataset_store
+from utils.duckdb_backend import BACKEND_ENV_VAR
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, 'app.py')
+SUBVIEWS = ["Passes", "Pass Network", "Field Zones", "Points", "Possessions", "Player Stats"]
+
+
+# app.py on ./data with the pandas backend, and APP_GUARD_SHARED=1 so a rerun that changed shared data in place fails
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setenv(GUARD_ENV_VAR, '1')
+    monkeypatch.delenv(BACKEND_ENV_VAR, raising=False)
+    monkeypatch.delenv(BUNDLE_ENV_VAR, raising=False)
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    at.secrets['username'], at.secrets['password'] = 'test', 'test'
+    return at
+
+def log_in(at):
+    at.run()
+    assert not at.exception
+    at.text_input[0].input('test')
+    at.text_input[1].input('test')
+    at.button[0].click()
+    at.run()
+    assert not at.exception
+
+def widget(elements, label):
+    return next(element for element in elements if element.label == label)
+
+def test_views_leave_shared_data_unchanged(app):
+    log_in(app)
+    for subview in SUBVIEWS:
+        widget(app.radio, 'Subview').set_value(subview)
+        app.run()
+        assert not app.exception, (subview, [e.value for e in app.exception])
+
+def test_guard_fails_reruns_that_stop_early(app):
+    log_in(app)
+    points = _dataset_store('data')['season_frames']['Points']
+    column = points.columns.get_loc('Point')
+    original = points.iat[0, column]
+    points.iat[0, column] = original + 1
+    try:
+        # No games selected: the rerun stops before the end of the script
+        widget(app.multiselect, 'Tournaments').set_value([])
+        app.run()
+        assert any('modified in place' in e.value for e in app.exception)
+    finally:
+        points.iat[0, column] = original
+
+def test_sidebar_shows_dataset_memory(app):
+    log_in(app)
+    assert len(widget(app.sidebar.expander, 'Dataset memory').dataframe) == 1
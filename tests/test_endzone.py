@@ -0,0 +1,42 @@
+import os
+
+import pytest
+
+from utils.dataset import build_season_frames
+from utils.endzone import endzone_attempts, red_zone_start_y
+from utils.field import START_Y
+from utils.load_data import load_tournament_csvs
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+
+@pytest.fixture(scope='module')
+def passes_df():
+    return build_season_frames(load_tournament_csvs(DATA_DIR))['Passes']
+
+# Outcome per point from a plain loop over each point's possessions and throws
+def loop_outcomes(passes_df, red_zone_yards):
+    start_y = red_zone_start_y(red_zone_yards)
+    outcomes = {}
+    for key, point in passes_df.groupby(['tournament_game', 'Point'], sort=False, observed=True):
+        attempts, scored = 0, False
+        for _, possession in point.groupby('Possession', observed=True):
+            in_red_zone = False
+            for y, assist in zip(possession[START_Y], possession['Assist?']):
+                in_red_zone = in_red_zone or y < start_y
+                scored = scored or (in_red_zone and assist == 1)
+            attempts += in_red_zone
+        if attempts:
+            outcomes[key] = 'clean' if scored and attempts == 1 else 'dirty' if scored else 'broken'
+    return outcomes
+
+def test_endzone_outcome_counts(passes_df):
+    _, points = endzone_attempts(passes_df)
+    assert points['Outcome'].value_counts().to_dict() == {'clean': 61, 'broken': 19, 'dirty': 14}
+
+@pytest.mark.parametrize('red_zone_yards', [10, 20, 30])
+def test_endzone_outcomes_match_loop(passes_df, red_zone_yards):
+    _, points = endzone_attempts(passes_df, red_zone_yards)
+    outcomes = dict(zip(zip(points['tournament_game'], points['Point']), points['Outcome']))
+    assert outcomes == loop_outcomes(passes_df, red_zone_yards)
@@ -0,0 +1,104 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.lineups import COMBINATION_METRICS, build_lineup_incidence, lineup_on_off, player_on_off, top_lineup_combinations
+
+
+# Two games: g1 has four points with lineups; in g2 point 1 has a lineup and point 2 is in nobody's list
+@pytest.fixture
+def incidence():
+    points = pd.DataFrame({
+        'Point': [1, 2, 3, 4, 1, 2],
+        'Started on offense?': [1, 0, 1, 0, 1, 1],
+        'Scored?': [1, 1, 0, 0, 1, 1],
+        'Possessions': [1, 2, 2, 1, 2, 1],
+    }, index=pd.MultiIndex.from_tuples([('T', 'g1')] * 4 + [('T', 'g2')] * 2, names=['tournament', 'game']))
+    player_stats = pd.DataFrame({
+        'Player': ['A', 'B', 'C', 'A', 'B'],
+        'Points played': ['1,2,3', '1,4', '2,3,4', '1', '1'],
+    }, index=pd.MultiIndex.from_tuples([('T', 'g1')] * 3 + [('T', 'g2')] * 2, names=['tournament', 'game']))
+    return build_lineup_incidence(player_stats, points)
+
+def test_unlisted_point_is_not_recorded(incidence):
+    assert incidence['points']['recorded'].tolist() == [True, True, True, True, True, False]
+    assert incidence['played'].sum(axis=0).tolist() == [4, 3, 3]
+
+def test_player_on_off(incidence):
+    table = player_on_off(incidence).set_index('Player')
+    assert table['Points on'].tolist() == [4, 3, 3]
+    assert table['O points on'].tolist() == [3, 2, 1]
+    assert table['D points on'].tolist() == [1, 1, 2]
+    # The unrecorded hold in g2 counts for nobody: B's only recorded O point off is the g1 point 3 non-hold
+    np.testing.assert_array_equal(table['Hold % on'], [66.7, 100.0, 0.0])
+    np.testing.assert_array_equal(table['Hold % off'], [np.nan, 0.0, 100.0])
+    np.testing.assert_array_equal(table['Clean hold % on'], [33.3, 50.0, 0.0])
+    np.testing.assert_array_equal(table['Clean hold % off'], [np.nan, 0.0, 50.0])
+    np.testing.assert_array_equal(table['Break % on'], [100.0, 0.0, 50.0])
+    np.testing.assert_array_equal(table['Break % off'], [0.0, 100.0, np.nan])
+    np.testing.assert_array_equal(table['Hold +/-'], [np.nan, 100.0, -100.0])
+    np.testing.assert_array_equal(table['Break +/-'], [100.0, -100.0, np.nan])
+
+def test_lineup_on_off(incidence):
+    table = lineup_on_off(incidence, ['A', 'B']).set_index('Lineup')
+    # g2 point 2 has neither A nor B listed but no recorded lineup, so it is not a "None on" point
+    assert table['Points'].tolist() == [2, 0]
+    assert table.loc['All on', ['O points', 'Holds', 'Clean holds', 'D points', 'Breaks']].tolist() == [2, 2, 1, 0, 0]
+    np.testing.assert_array_equal(table['Hold %'], [100.0, np.nan])
+    np.testing.assert_array_equal(table['Clean hold %'], [50.0, np.nan])
+    np.testing.assert_array_equal(table['Break %'], [np.nan, np.nan])
+
+# Random 60 point x 7 player incidence matrix with a few points that have no recorded lineup
+@pytest.fixture
+def random_incidence():
+    rng = np.random.default_rng(0)
+    played = rng.random((60, 7)) < 0.6
+    played[:5] = False
+    points = pd.DataFrame({
+        'offense': rng.random(60) < 0.6,
+        'scored': rng.random(60) < 0.6,
+        'possessions': rng.integers(1, 4, 60),
+        'recorded': played.any(axis=1),
+    })
+    return {'points': points, 'players': pd.Index(list('ABCDEFG'), name='Player'), 'played': played}
+
+# Every `size`-player combination with at least min_points shared points as (players, points, successes, rate)
+def brute_force_combinations(incidence, size, metric, min_points):
+    side, success = COMBINATION_METRICS[metric]
+    points = incidence['points']
+    offense, scored = points['offense'].to_numpy(), points['scored'].to_numpy()
+    side_mask = offense if side == 'O points' else ~offense
+    success_mask = {
+        'Holds': offense & scored,
+        'Clean holds': offense & scored & (points['possessions'].to_numpy() == 1),
+        'Breaks': ~offense & scored,
+    }[success]
+    rows = []
+    for combination in itertools.combinations(range(len(incidence['players'])), size):
+        together = side_mask & incidence['played'][:, list(combination)].all(axis=1)
+        if together.sum() >= min_points:
+            successes = int((together & success_mask).sum())
+            rows.append((' + '.join(incidence['players'][list(combination)]), int(together.sum()), successes, round(successes / together.sum() * 100, 1)))
+    return rows
+
+@pytest.mark.parametrize('metric', list(COMBINATION_METRICS))
+@pytest.mark.parametrize('size', [2, 3])
+def test_top_lineup_combinations_match_brute_force(random_incidence, metric, size):
+    side, success = COMBINATION_METRICS[metric]
+    expected = brute_force_combinations(random_incidence, size, metric, 5)
+    table = top_lineup_combinations(random_incidence, size, metric, min_points=5, top_k=100)
+    rows = list(table[['Players', side, success, metric]].itertuples(index=False, name=None))
+    assert sorted(rows) == sorted(expected)
+    assert list(zip(table[metric], table[side])) == sorted(zip(table[metric], table[side]), reverse=True)
+
+    top = top_lineup_combinations(random_incidence, size, metric, min_points=5, top_k=3)
+    assert list(zip(top[metric], top[side])) == sorted(((rate, num) for _, num, _, rate in expected), reverse=True)[:3]
+
+def test_top_lineup_combinations_vs_team_uses_recorded_points(random_incidence):
+    points = random_incidence['points']
+    recorded_o = points['offense'] & points['recorded']
+    team_rate = (recorded_o & points['scored']).sum() / recorded_o.sum() * 100
+    table = top_lineup_combinations(random_incidence, 2, 'Hold %', min_points=5, top_k=5)
+    np.testing.assert_allclose(table['vs team'], (table['Hold %'] - team_rate).round(1))
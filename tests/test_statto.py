@@ -0,0 +1,60 @@
+import os
+
+import pandas as pd
+import pytest
+
+from utils.load_data import load_tournament_csvs
+from utils.statto import load_statto_archive
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARCHIVE_PATH = os.path.join(ROOT, 'Nemesis_2025_2025-09-04_17-46-25.statto')
+DATA_DIR = os.path.join(ROOT, 'data')
+# Archive game key -> (tournament, game) folder of the CSV export of the same game in data/
+GAME_FOLDERS = {
+    '2025-07-12 PEC-W Sat Dark Sky': ('pec', 'sat_dark_sky'),
+    '2025-07-12 PEC-W Sat Riot': ('pec', 'sat_riot'),
+    '2025-07-12 PEC-W Sat Nightlock': ('pec', 'sat_nightlock'),
+    '2025-07-13 PEC-W Sun Pop': ('pec', 'sun_pop'),
+    '2025-07-13 PEC-W Sun Flipside': ('pec', 'sun_flipside'),
+    '2025-07-13 PEC-W Sun Riot': ('pec', 'sun_riot'),
+    '2025-08-16 ESC Saturday Vengeance Pool': ('esc', 'sat_vengeance'),
+    '2025-08-16 ESC Saturday Starling Pool': ('esc', 'sat_starling'),
+    '2025-08-16 ESC Saturday Flight Pool': ('esc', 'sat_flight'),
+    '2025-08-17 ESC Sunday Heist 9th Quarters': ('esc', 'sun_heist'),
+    '2025-08-17 ESC Sunday LOL 9th Semis': ('esc', 'sun_lol'),
+}
+
+
+@pytest.fixture(scope='module')
+def archive():
+    return load_statto_archive(ARCHIVE_PATH)['Nemesis 2025']
+
+@pytest.fixture(scope='module')
+def exports():
+    return load_tournament_csvs(DATA_DIR)
+
+def test_archive_has_every_exported_game(archive):
+    assert list(archive) == list(GAME_FOLDERS)
+
+# Every table of every game matches the CSV export. tournament_game names the tournament, which is the team
+# name in the archive and the folder in data/; the CSV export rounds distances to 2 decimals and orders
+# Player Stats differently, and forward distances are float32 in the export.
+@pytest.mark.parametrize('game', list(GAME_FOLDERS))
+def test_archive_matches_csv_export(archive, exports, game):
+    tournament, folder = GAME_FOLDERS[game]
+    exported = exports[tournament][folder]
+    assert set(archive[game]) == set(exported)
+    for name, table in archive[game].items():
+        expected = exported[name]
+        if name == 'Player Stats':
+            table = table.sort_values('Player').reset_index(drop=True)
+            expected = expected.sort_values('Player').reset_index(drop=True)
+            tolerance = {'atol': 0.01}
+        else:
+            tolerance = {'rtol': 1e-5, 'atol': 1e-5}
+        pd.testing.assert_frame_equal(
+            table.drop(columns='tournament_game', errors='ignore'),
+            expected.drop(columns='tournament_game', errors='ignore'),
+            check_dtype=False, check_categorical=False, check_like=True, obj=f"{game} {name}", **tolerance,
+        )
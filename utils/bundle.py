@@ -0,0 +1,133 @@
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+
+
+BUNDLE_ENV_VAR = 'APP_BUNDLE'   # season bundle directory written by build_bundle.py; unset to parse data/ at runtime
+MANIFEST_FILE = 'manifest.json'
+BUNDLE_FORMAT = 1
+GAME_COLUMNS = ['tournament', 'game']
+
+
+# Whether the optional pyarrow package can be imported
+def pyarrow_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+# Bundle directory requested through APP_BUNDLE, or None
+def requested_bundle():
+    return os.environ.get(BUNDLE_ENV_VAR) or None
+
+# Bundle the app reads its season frames from: the requested one when it has a manifest and pyarrow is installed
+def active_bundle():
+    path = requested_bundle()
+    if path and pyarrow_available() and os.path.isfile(os.path.join(path, MANIFEST_FILE)):
+        return path
+    return None
+
+# (size, mtime) of the bundle manifest, which is written last and so changes whenever the bundle is rebuilt
+def bundle_stat(path):
+    stat = os.stat(os.path.join(path, MANIFEST_FILE))
+    return stat.st_size, stat.st_mtime_ns
+
+def read_manifest(path):
+    with open(os.path.join(path, MANIFEST_FILE)) as f:
+        return json.load(f)
+
+# Prefix of the versioned bundle directories written next to the bundle path, e.g. .season_bundle-1a2b3c
+def bundle_prefix(path):
+    return f".{os.path.basename(os.path.normpath(path))}-"
+
+# Make the bundle path a symlink to the complete bundle directory `target` (written next to it by write_bundle).
+# The new link is renamed over the old one, so a reader resolving the path finds the old bundle or the new one,
+# never nothing. The bundle it replaces is kept for processes that resolved it just before the swap; older
+# complete bundles are removed.
+def publish_bundle(target, path):
+    parent = os.path.dirname(os.path.abspath(path))
+    prefix = bundle_prefix(path)
+    previous = os.path.realpath(path) if os.path.islink(path) else None
+    if os.path.isdir(path) and not os.path.islink(path):
+        # A bundle written before bundles were published through a symlink; moved aside once
+        previous = tempfile.mkdtemp(prefix=prefix, dir=parent)
+        os.rmdir(previous)
+        os.rename(path, previous)
+    link = os.path.join(parent, f"{prefix}link-{os.getpid()}")
+    if os.path.lexists(link):
+        os.remove(link)
+    os.symlink(os.path.basename(target), link)
+    os.replace(link, path)
+    keep = {os.path.realpath(target), previous}
+    for entry in os.scandir(parent):
+        if (entry.name.startswith(prefix) and entry.is_dir(follow_symlinks=False) and os.path.realpath(entry.path) not in keep
+                and os.path.isfile(os.path.join(entry.path, MANIFEST_FILE))):
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+# Replace the directory at path with staging. The old directory is renamed away before the new one is renamed in,
+# so the path briefly holds nothing: callers that scan it concurrently (the ingest worker) swap under a lock.
+def swap_directory(staging, path):
+    old = None
+    if os.path.exists(path):
+        old = tempfile.mkdtemp(prefix='.old-', dir=os.path.dirname(os.path.abspath(path)))
+        os.rmdir(old)
+        os.rename(path, old)
+    os.rename(staging, path)
+    if old:
+        shutil.rmtree(old, ignore_errors=True)
+
+# Write season frames (indexed by (tournament, game)) as one uncompressed Arrow IPC (Feather v2) file per table,
+# plus a manifest with the data version, the (tournament, game) pairs in display order and the source files.
+# Uncompressed files can be memory-mapped and read without copying numeric columns. The bundle is written to a
+# new directory next to path and published with publish_bundle(), so path then links to it.
+def write_bundle(path, season_frames, games, version, sources):
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    staging = tempfile.mkdtemp(prefix=bundle_prefix(path), dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        # mkdtemp creates the directory private to this user; other server processes need to read the bundle
+        os.chmod(staging, 0o755)
+        tables = {}
+        for name, frame in season_frames.items():
+            file = f"{name}.arrow"
+            table = pa.Table.from_pandas(frame.reset_index(), preserve_index=False)
+            feather.write_feather(table, os.path.join(staging, file), compression='uncompressed')
+            tables[name] = {'file': file, 'rows': len(frame), 'columns': len(frame.columns)}
+        manifest = {
+            'format': BUNDLE_FORMAT,
+            'version': version,
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'games': [list(game) for game in games],
+            'tables': tables,
+            'sources': sources,
+        }
+        with open(os.path.join(staging, MANIFEST_FILE), 'w') as f:
+            json.dump(manifest, f, indent=1)
+        publish_bundle(staging, path)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return manifest
+
+# Memory-map a bundle's tables back into season frames indexed by (tournament, game). Returns (manifest, frames).
+# Numeric columns without missing values point straight into the mapped files, so server processes reading the
+# same bundle share those pages through the OS page cache; other columns are converted into process memory.
+def read_bundle(path):
+    import pyarrow.feather as feather
+
+    # Resolved once, so a bundle published meanwhile is not read half from each directory
+    path = os.path.realpath(path)
+    manifest = read_manifest(path)
+    if manifest.get('format') != BUNDLE_FORMAT:
+        raise ValueError(f"{path} is a format {manifest.get('format')} bundle; rebuild it with build_bundle.py")
+    season_frames = {}
+    for name, table in manifest['tables'].items():
+        frame = feather.read_table(os.path.join(path, table['file']), memory_map=True).to_pandas(split_blocks=True)
+        # In place, so the remaining columns are not copied out of the mapping
+        frame.set_index(GAME_COLUMNS, inplace=True)
+        season_frames[name] = frame
+    return manifest, season_frames
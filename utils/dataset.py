@@ -0,0 +1,661 @@
+import hashlib
+import os
+import threading
+import time
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils import bundle, duckdb_backend, ingest
+from utils.lineups import build_lineup_incidence, select_lineup_incidence
+from utils.load_data import archive_manifest, folder_manifest, load_game_folders, load_team_csvs, tournament_manifest
+from utils.network import EDGE_COLUMNS, pass_connections, pass_network_edges
+from utils.possessions import build_possession_indexes
+from utils.schema import apply_schema, memory_report
+from utils.spatial import ZONE_SIZE, ZONE_STAT_COLUMNS, zone_stats
+from utils.stats import player_pass_cube, throw_outcome_counts
+from utils.statto import load_statto_archive
+
+
+SELECTION_CACHE_SIZE = 16  # results kept per selection cache (pass network, zone stats)
+GUARD_ENV_VAR = 'APP_GUARD_SHARED'  # set to 1 (as the test harnesses do) to fail when a view mutates shared data
+PREWARM_ENV_VAR = 'APP_PREWARM'     # set to 1 to build the dataset in the background on the first page load
+INGEST_LOG_SIZE = 100               # most recent drop folder outcomes kept for the sidebar
+
+
+class SharedDataMutated(RuntimeError):
+    pass
+
+
+# Short, stable hash of a manifest; changes whenever any file is added, removed or modified
+def manifest_version(manifest):
+    digest = hashlib.sha1(repr(sorted(manifest.items())).encode())
+    return digest.hexdigest()[:12]
+
+# Process-wide store shared by every session. Each refresh publishes new dicts rather than
+# mutating the published ones, so a session that already holds a snapshot never sees a partial update.
+@st.cache_resource(show_spinner=False)
+def _dataset_store(data_dir):
+    return {
+        'lock': threading.Lock(),
+        'manifest': {},
+        'tournament_data': {},
+        'folder_data': {},
+        'load_errors': {},
+        'archive_manifest': {},
+        'archive_data': {},
+        'team_manifest': None,
+        'team_data': {},
+        'version': manifest_version({}),
+        'season_version': None,
+        'season_frames': {},
+        'memory_report': None,
+        'throw_counts_version': None,
+        'throw_counts': None,
+        'possession_indexes_version': None,
+        'possession_indexes': {},
+        'player_cube_version': None,
+        'player_cube': None,
+        'lineups_version': None,
+        'lineups': None,
+        'duckdb': None,
+        'duckdb_version': None,
+        'duckdb_sync': threading.Lock(),
+        'network_version': None,
+        'network_games': {},
+        'network_edges': None,
+        'selection_caches': {},
+        'fingerprints': {},
+        'prewarm': None,
+        'bundle_stat': None,
+        'bundle_manifest': None,
+        'ingest': None,
+        'ingest_log': [],
+    }
+
+# Archive tournaments sit alongside the folder tournaments; games of the same name merge
+def merge_tournament_data(folder_data, archive_data):
+    tournament_data = {tournament: dict(games) for tournament, games in folder_data.items()}
+    for archive_tournaments in archive_data.values():
+        for tournament, games in archive_tournaments.items():
+            tournament_data.setdefault(tournament, {}).update(games)
+    return tournament_data
+
+# Version of the data described by the game folder and archive manifests
+def dataset_version(manifest, archives):
+    return manifest_version({**manifest, **{(path, ''): stat for path, stat in archives.items()}})
+
+# Reload only the game folders and .statto archives whose files changed since the last call. Files that fail to
+# parse are left out and recorded in store['load_errors'] ({(tournament, game) or archive path: [(path, error)]})
+# until their game folder or archive changes again.
+def _refresh_tournament_data(store, data_dir, manifest, archives):
+    old_manifest = store['manifest']
+    changed = {key: game_manifest for key, game_manifest in manifest.items() if old_manifest.get(key) != game_manifest}
+    loaded, errors = load_game_folders(changed)
+    load_errors = {}
+    folder_data = {}
+    for key in sorted(manifest):
+        tournament, game = key
+        if key in loaded:
+            game_data = loaded[key]
+            if key in errors:
+                load_errors[key] = [(path, f"{type(e).__name__}: {e}") for path, e in errors[key]]
+        else:
+            game_data = store['folder_data'][tournament][game]
+            if key in store['load_errors']:
+                load_errors[key] = store['load_errors'][key]
+        folder_data.setdefault(tournament, {})[game] = game_data
+
+    archive_data = {}
+    for path, stat in sorted(archives.items()):
+        if store['archive_manifest'].get(path) == stat:
+            archive_data[path] = store['archive_data'][path]
+            if path in store['load_errors']:
+                load_errors[path] = store['load_errors'][path]
+        else:
+            try:
+                archive_data[path] = load_statto_archive(path)
+            except Exception as e:
+                load_errors[path] = [(path, f"{type(e).__name__}: {e}")]
+                archive_data[path] = {}
+
+    store['load_errors'] = load_errors
+    store['folder_data'] = folder_data
+    store['archive_data'] = archive_data
+    store['tournament_data'] = merge_tournament_data(folder_data, archive_data)
+    store['manifest'] = manifest
+    store['archive_manifest'] = archives
+    store['version'] = dataset_version(manifest, archives)
+
+# Tournament data, dataset version and [(path, error)] of the files that could not be loaded, for data_dir loaded
+# from scratch outside the shared store (build_bundle.py)
+def load_tournament_data(data_dir):
+    state = {'manifest': {}, 'folder_data': {}, 'archive_manifest': {}, 'archive_data': {}, 'load_errors': {}}
+    _refresh_tournament_data(state, data_dir, tournament_manifest(data_dir), archive_manifest(data_dir))
+    return state['tournament_data'], state['version'], [error for errors in state['load_errors'].values() for error in errors]
+
+# Memory-map the season bundle (see utils.bundle) when it was rebuilt since the last call. The bundle replaces the
+# game folders: tournament data only lists its (tournament, game) pairs and the season frames come from the bundle.
+def _refresh_bundle(store, path):
+    stat = (path, bundle.bundle_stat(path))
+    if stat == store['bundle_stat']:
+        return
+    manifest, season_frames = bundle.read_bundle(path)
+    tournament_data = {}
+    for tournament, game in manifest['games']:
+        tournament_data.setdefault(tournament, {})[game] = {}
+    store['tournament_data'] = tournament_data
+    store['version'] = manifest['version']
+    store['season_frames'] = season_frames
+    store['memory_report'] = memory_report(season_frames)
+    store['season_version'] = manifest['version']
+    store['bundle_manifest'] = manifest
+    store['bundle_stat'] = stat
+
+# Season bundle the store serves: the active one, or the one already mapped into the store while APP_BUNDLE's
+# path is briefly missing, so sessions keep reading it instead of falling back to parsing data_dir
+def _serving_bundle(store):
+    path = bundle.active_bundle()
+    if path:
+        return path
+    requested = bundle.requested_bundle()
+    if requested and store['bundle_stat'] and store['bundle_stat'][0] == requested:
+        return requested
+    return None
+
+# Cached tournament data for data_dir plus its dataset version, refreshed incrementally from disk.
+# Game folders under data/<tournament>/<game>/ and .statto archives directly in data/ are both picked up.
+# With APP_BUNDLE set to a built season bundle, the data comes from the bundle instead.
+# Downstream caches should include the version in their key.
+def get_tournament_data(data_dir):
+    store = _dataset_store(data_dir)
+    if _serving_bundle(store):
+        with store['lock']:
+            path = bundle.active_bundle()
+            if path:
+                _refresh_bundle(store, path)
+            return store['tournament_data'], store['version']
+    with store['lock']:
+        # Scanned under the lock, so a game the ingest worker is moving into data_dir is seen together with
+        # the dataset version that includes it
+        manifest = tournament_manifest(data_dir)
+        archives = archive_manifest(data_dir)
+        if manifest != store['manifest'] or archives != store['archive_manifest']:
+            _refresh_tournament_data(store, data_dir, manifest, archives)
+        return store['tournament_data'], store['version']
+
+# Dataset version of data_dir worked out from its file manifests alone, without loading any game (or the version
+# of the active season bundle). Equal to the version get_tournament_data() returns for the same files.
+def current_version(data_dir):
+    if _serving_bundle(_dataset_store(data_dir)):
+        return get_tournament_data(data_dir)[1]
+    return dataset_version(tournament_manifest(data_dir), archive_manifest(data_dir))
+
+# {tournament: [games]} in display order. With APP_BACKEND=duckdb the list comes from the database, so it needs
+# no game loaded while the database holds the current version.
+def get_season_games(data_dir):
+    if duckdb_backend.active_backend() == 'duckdb':
+        return duckdb_backend.stored_games(get_duckdb(data_dir))
+    tournament_data, _ = get_tournament_data(data_dir)
+    return {tournament: list(games) for tournament, games in tournament_data.items()}
+
+# Cached top-level team CSVs, reloaded only when one of them changes
+def get_team_data(data_dir):
+    store = _dataset_store(data_dir)
+    manifest = folder_manifest(data_dir)
+    with store['lock']:
+        if manifest != store['team_manifest']:
+            store['team_data'] = load_team_csvs(data_dir)
+            store['team_manifest'] = manifest
+        return store['team_data']
+
+# One frame per stat file with every game concatenated once, indexed by (tournament, game)
+def build_season_frames(tournament_data):
+    tables = {}
+    for tournament in sorted(tournament_data):
+        for game in sorted(tournament_data[tournament]):
+            for name, df in tournament_data[tournament][game].items():
+                tables.setdefault(name, {})[(tournament, game)] = df
+    season_frames = {}
+    for name, frames in tables.items():
+        season = pd.concat(frames, names=['tournament', 'game', None])
+        # Per-game categoricals have different categories and concatenate to object, so recast the season frame
+        season_frames[name] = apply_schema(season.droplevel(-1))
+    return season_frames
+
+# Cached season frames for the current dataset version. The version is read under the lock: another session or
+# the ingest worker may have published a newer one since get_tournament_data() returned.
+def get_season_frames(data_dir):
+    get_tournament_data(data_dir)
+    store = _dataset_store(data_dir)
+    with store['lock']:
+        if store['season_version'] != store['version']:
+            store['season_frames'] = build_season_frames(store['tournament_data'])
+            store['memory_report'] = memory_report(store['season_frames'])
+            store['season_version'] = store['version']
+        return store['season_frames']
+
+# Rows, columns and memory of each season frame, measured when the frames are built. With APP_BACKEND=duckdb
+# the frames are only built once a view needs them, so this is None until then.
+def get_memory_report(data_dir):
+    if duckdb_backend.active_backend() != 'duckdb':
+        get_season_frames(data_dir)
+    return _dataset_store(data_dir)['memory_report']
+
+# Manifest of the season bundle the data was read from, or None when it was parsed from data_dir
+def get_bundle_manifest(data_dir):
+    if not _serving_bundle(_dataset_store(data_dir)):
+        return None
+    get_tournament_data(data_dir)
+    return _dataset_store(data_dir)['bundle_manifest']
+
+# Throw category x outcome counts for every game and line (Started on offense?) behind the team throwing stats,
+# indexed by (tournament, game) like the season frames so select_games() slices it the same way.
+# Per-player throwing tables use the player pass cube instead.
+def build_throw_counts(season_frames):
+    passes = season_frames['Passes']
+    keys = ['tournament', 'game'] + [column for column in ['Started on offense?'] if column in passes.columns]
+    return throw_outcome_counts(passes, keys).set_index(['tournament', 'game'])
+
+# Point x player incidence matrix (see utils.lineups), or None without Player Stats and Points
+def build_lineups(season_frames):
+    if 'Player Stats' in season_frames and 'Points' in season_frames:
+        return read_only(build_lineup_incidence(season_frames['Player Stats'], season_frames['Points']))
+    return None
+
+# Cached throw outcome counts (see build_throw_counts)
+def get_throw_outcome_counts(data_dir):
+    season_frames = get_season_frames(data_dir)
+    store = _dataset_store(data_dir)
+    with store['lock']:
+        if store['throw_counts_version'] != store['season_version']:
+            store['throw_counts'] = build_throw_counts(season_frames)
+            store['throw_counts_version'] = store['season_version']
+        return store['throw_counts']
+
+# Cached per game x player x role pass counts, indexed by (tournament, game) for select_games()
+def get_player_pass_cube(data_dir):
+    season_frames = get_season_frames(data_dir)
+    store = _dataset_store(data_dir)
+    with store['lock']:
+        if store['player_cube_version'] != store['season_version']:
+            store['player_cube'] = apply_schema(player_pass_cube(season_frames['Passes']))
+            store['player_cube_version'] = store['season_version']
+        return store['player_cube']
+
+# Cached point x player incidence matrix built from the Player Stats "Points played" lists (see utils.lineups)
+def get_lineup_incidence(data_dir):
+    season_frames = get_season_frames(data_dir)
+    store = _dataset_store(data_dir)
+    with store['lock']:
+        if store['lineups_version'] != store['season_version']:
+            store['lineups'] = build_lineups(season_frames)
+            store['lineups_version'] = store['season_version']
+        return store['lineups']
+
+# Cached per-game possession indexes (see utils.possessions), keyed by tournament_game
+def get_possession_indexes(data_dir):
+    season_frames = get_season_frames(data_dir)
+    store = _dataset_store(data_dir)
+    with store['lock']:
+        if store['possession_indexes_version'] != store['season_version']:
+            store['possession_indexes'] = build_possession_indexes(season_frames['Passes'])
+            store['possession_indexes_version'] = store['season_version']
+        return store['possession_indexes']
+
+# {(tournament, game): (Passes frame, edges)} for every game, reusing the cached edges of games whose Passes frame
+# is the one they were counted from; the other games are counted together in one pass
+def build_network_games(tournament_data, cached_games):
+    network_games = {}
+    new_passes = {}
+    for tournament in sorted(tournament_data):
+        for game in sorted(tournament_data[tournament]):
+            passes = tournament_data[tournament][game].get('Passes')
+            cached = cached_games.get((tournament, game))
+            if passes is None:
+                continue
+            if cached is not None and cached[0] is passes:
+                network_games[(tournament, game)] = cached
+            else:
+                new_passes[(tournament, game)] = passes
+    if new_passes:
+        new_edges = pass_network_edges(pd.concat(new_passes, names=['tournament', 'game', None]).droplevel(-1))
+        game_edges = dict(iter(new_edges.groupby(level=['tournament', 'game'], sort=False)))
+        for key, passes in new_passes.items():
+            network_games[key] = (passes, game_edges.get(key, new_edges.iloc[:0]))
+    return network_games
+
+def season_network_edges(network_games):
+    edges = [network_games[key][1] for key in sorted(network_games)]
+    return pd.concat(edges) if edges else pd.DataFrame(columns=['Thrower', 'Receiver'] + EDGE_COLUMNS)
+
+# Per-game pass network edges indexed by (tournament, game). Edges are kept per game next to the Passes frame
+# they were counted from, so a refresh only counts games whose Passes frame was (re)loaded. A season bundle has no
+# per-game frames and is rebuilt as a whole, so its edges are counted from the season Passes frame.
+def get_pass_network_edges(data_dir):
+    get_tournament_data(data_dir)
+    store = _dataset_store(data_dir)
+    with store['lock']:
+        tournament_data, version = store['tournament_data'], store['version']
+        if store['network_version'] != version and _serving_bundle(store):
+            store['network_edges'] = pass_network_edges(store['season_frames']['Passes'])
+            store['network_games'] = {}
+            store['network_version'] = version
+        elif store['network_version'] != version:
+            store['network_games'] = build_network_games(tournament_data, store['network_games'])
+            store['network_edges'] = season_network_edges(store['network_games'])
+            store['network_version'] = version
+        return store['network_edges']
+
+# Result of build() for a selection key, kept in a small per-name cache that is dropped when the data version
+# changes. The oldest entry is evicted once SELECTION_CACHE_SIZE selections are cached.
+def _cached_selection(data_dir, name, key, build):
+    if duckdb_backend.active_backend() == 'duckdb':
+        version = current_version(data_dir)
+    else:
+        _, version = get_tournament_data(data_dir)
+    store = _dataset_store(data_dir)
+    with store['lock']:
+        cache_version, cache = store['selection_caches'].get(name, (None, {}))
+        if cache_version != version:
+            cache = {}
+            store['selection_caches'][name] = (version, cache)
+        if key in cache:
+            return cache[key]
+    result = build()
+    with store['lock']:
+        if len(cache) >= SELECTION_CACHE_SIZE:
+            cache.pop(next(iter(cache)))
+        cache[key] = result
+    return result
+
+# Thrower -> receiver connections for a game selection, cached per selection
+def get_pass_network(data_dir, selected_games):
+    def build():
+        edges = get_pass_network_edges(data_dir)
+        return pass_connections(edges[edges.index.isin(selected_games)])
+    return _cached_selection(data_dir, 'pass network', tuple(sorted(selected_games)), build)
+
+# Incidence matrix rows of the selected games for the lineup on/off tables, cached per selection
+def get_lineups(data_dir, selected_games):
+    def build():
+        incidence = get_lineup_incidence(data_dir)
+        return read_only(select_lineup_incidence(incidence, selected_games)) if incidence is not None else None
+    return _cached_selection(data_dir, 'lineups', tuple(sorted(selected_games)), build)
+
+# Zone counts (see utils.spatial.zone_stats) of the selected games' throws, filtered on {column: value}
+# (e.g. Thrower, Started on offense?), cached per selection and grid
+def get_zone_stats(data_dir, selected_games, filters=None, zone_size=ZONE_SIZE, at='start'):
+    def build():
+        passes = select_table(data_dir, 'Passes', selected_games, filters, ZONE_STAT_COLUMNS)
+        return read_only(zone_stats(passes, zone_size, at))
+    key = (tuple(sorted(selected_games)), tuple(sorted((filters or {}).items())), zone_size, at)
+    return _cached_selection(data_dir, 'zone stats', key, build)
+
+# Rows of a season frame for the selected (tournament, game) pairs, with a fresh index for the views.
+# Season frames are sorted by game, so a run of consecutive games (e.g. one tournament, or everything) is a
+# positional slice; with copy-on-write that shares the season frame's memory until a view writes to it.
+def select_games(frame, selected_games):
+    mask = frame.index.isin(selected_games)
+    if mask.all():
+        return frame.reset_index(drop=True)
+    rows = np.flatnonzero(mask)
+    if len(rows) and rows[-1] - rows[0] + 1 == len(rows):
+        return frame.iloc[rows[0]:rows[-1] + 1].reset_index(drop=True)
+    return frame[mask].reset_index(drop=True)
+
+# DuckDB connection holding the season tables of this data directory, synced to the current data version.
+# The version is worked out from the file manifests, so while the database holds it (e.g. after a restart) no
+# game is loaded and no season frame built. Otherwise the season frames are written to the database off the
+# store lock, one sync at a time; queries keep reading the previous tables until the new ones are swapped in.
+def get_duckdb(data_dir):
+    store = _dataset_store(data_dir)
+    version = current_version(data_dir)
+    with store['lock']:
+        if store['duckdb'] is None:
+            store['duckdb'] = duckdb_backend.connect()
+            store['duckdb_version'] = duckdb_backend.stored_version(store['duckdb'])
+        if store['duckdb_version'] == version:
+            return store['duckdb']
+    with store['duckdb_sync']:
+        with store['lock']:
+            if store['duckdb_version'] == version:
+                return store['duckdb']
+        get_season_frames(data_dir)
+        with store['lock']:
+            con = store['duckdb']
+            tournament_data, season_frames, version = store['tournament_data'], store['season_frames'], store['season_version']
+        games = [(tournament, game) for tournament, games in tournament_data.items() for game in games]
+        duckdb_backend.sync_tables(con, season_frames, version, games)
+        with store['lock']:
+            store['duckdb_version'] = version
+        return con
+
+# pandas equivalent of duckdb_backend.query_table(): select_games() followed by {column: value} filters and a projection
+def select_rows(frame, selected_games, filters=None, columns=None):
+    df = select_games(frame, selected_games)
+    for column, value in (filters or {}).items():
+        df = df[df[column] == value]
+    return df[columns] if columns else df
+
+# Rows of a season table for the selected games, optionally filtered on {column: value} and projected to `columns`.
+# With APP_BACKEND=duckdb the selection and filters run as SQL on the database; otherwise the season frame is sliced in pandas.
+def select_table(data_dir, name, selected_games, filters=None, columns=None):
+    if duckdb_backend.active_backend() == 'duckdb':
+        return duckdb_backend.query_table(get_duckdb(data_dir), name, selected_games, filters, columns)
+    return select_rows(get_season_frames(data_dir)[name], selected_games, filters, columns)
+
+def prewarm_enabled():
+    return os.environ.get(PREWARM_ENV_VAR, '') not in ('', '0')
+
+# Load the dataset and build the season-wide aggregates the views share, so the first session to need them
+# finds them cached. Each accessor holds the store lock while it builds, so a session asking for the same
+# data meanwhile waits for this build instead of starting its own.
+def _prewarm(data_dir):
+    get_team_data(data_dir)
+    get_season_frames(data_dir)
+    get_throw_outcome_counts(data_dir)
+    get_player_pass_cube(data_dir)
+    get_possession_indexes(data_dir)
+    get_lineup_incidence(data_dir)
+    get_pass_network_edges(data_dir)
+    if duckdb_backend.active_backend() == 'duckdb':
+        get_duckdb(data_dir)
+
+# With APP_PREWARM=1, start _prewarm() in a background thread, once per process. Streamlit runs no code until the
+# first session connects, so the app calls this before the login form: the data loads while the user logs in.
+def start_prewarm(data_dir):
+    if not prewarm_enabled():
+        return None
+    store = _dataset_store(data_dir)
+    with store['lock']:
+        if store['prewarm'] is not None:
+            return store['prewarm']
+        store['prewarm'] = threading.Thread(target=_prewarm, args=(data_dir,), name='dataset-prewarm', daemon=True)
+    store['prewarm'].start()
+    return store['prewarm']
+
+# Add outcomes ({'export', 'status', 'detail'}) to the ingest log; a new list is published so readers keep a snapshot
+def _log_ingest(store, entries):
+    stamp = time.strftime('%Y-%m-%d %H:%M:%S')
+    with store['lock']:
+        store['ingest_log'] = (store['ingest_log'] + [{'time': stamp, **entry} for entry in entries])[-INGEST_LOG_SIZE:]
+
+# Files in data_dir that could not be parsed as of the current dataset version, as [{'file', 'error'}]
+def get_load_errors(data_dir):
+    load_errors = _dataset_store(data_dir)['load_errors']
+    return [{'file': path, 'error': error} for errors in load_errors.values() for path, error in errors]
+
+# Outcomes of the most recent drop folder ingests, oldest first
+def get_ingest_log(data_dir):
+    return _dataset_store(data_dir)['ingest_log']
+
+# Ingest the exports that sat unchanged in the drop folder since the previous scan (`pending`) and publish them as
+# one new dataset version. Parsing, copying into data_dir and building the season frames and caches all happen
+# off the store lock; only the renames into place and the swap of the store entries hold it, so sessions neither
+# wait for an ingest nor see part of one. Rejected exports are quarantined. Returns the scan for the next call.
+def ingest_drop(data_dir, drop, pending):
+    scan = ingest.scan_drop(drop)
+    ready = [key for key, signature in scan.items() if signature and pending.get(key) == signature]
+    if not ready:
+        return scan
+    store = _dataset_store(data_dir)
+
+    parsed = {}
+    outcomes = []
+    for key in ready:
+        try:
+            parsed[key] = ingest.parse_export(drop, key)
+        except Exception as e:
+            outcomes.append({'export': '/'.join(key[1:]), 'status': 'quarantined', 'detail': ingest.quarantine_export(drop, key, e)})
+    staged = {}
+    try:
+        for key in parsed:
+            staged[key] = ingest.stage_export(data_dir, drop, key)
+        # Bring the store up to date with data_dir, then build the next version on top of it
+        get_tournament_data(data_dir)
+        while staged:
+            with store['lock']:
+                base_version = store['version']
+                folder_data = {tournament: dict(games) for tournament, games in store['folder_data'].items()}
+                archive_data = dict(store['archive_data'])
+                cached_network = store['network_games']
+            for key, data in parsed.items():
+                if key[0] == 'archive':
+                    archive_data[ingest.installed_path(data_dir, key)] = data
+                else:
+                    folder_data.setdefault(key[1], {})[key[2]] = data
+            tournament_data = merge_tournament_data(folder_data, archive_data)
+            season_frames = build_season_frames(tournament_data)
+            network_games = build_network_games(tournament_data, cached_network)
+            caches = {
+                'throw_counts': build_throw_counts(season_frames),
+                'player_cube': apply_schema(player_pass_cube(season_frames['Passes'])),
+                'possession_indexes': build_possession_indexes(season_frames['Passes']),
+                'lineups': build_lineups(season_frames),
+            }
+            network_edges = season_network_edges(network_games)
+            report = memory_report(season_frames)
+
+            with store['lock']:
+                if store['version'] != base_version:
+                    # A session reloaded a change in data_dir meanwhile; rebuild on top of it
+                    continue
+                manifest = dict(store['manifest'])
+                archives = dict(store['archive_manifest'])
+                for key, staging in staged.items():
+                    target = ingest.install_export(data_dir, key, staging)
+                    if key[0] == 'archive':
+                        stat = os.stat(target)
+                        archives[target] = (stat.st_size, stat.st_mtime_ns)
+                    else:
+                        manifest[(key[1], key[2])] = folder_manifest(target)
+                version = dataset_version(manifest, archives)
+                # Installed exports replace whatever failed to load in their place before
+                replaced = {(key[1], key[2]) if key[0] == 'game' else ingest.installed_path(data_dir, key) for key in staged}
+                store['load_errors'] = {key: errors for key, errors in store['load_errors'].items() if key not in replaced}
+                store['folder_data'] = folder_data
+                store['archive_data'] = archive_data
+                store['tournament_data'] = tournament_data
+                store['manifest'] = manifest
+                store['archive_manifest'] = archives
+                store['version'] = version
+                store['season_frames'] = season_frames
+                store['memory_report'] = report
+                store['season_version'] = version
+                for name, value in caches.items():
+                    store[name] = value
+                    store[f"{name}_version"] = version
+                store['network_games'] = network_games
+                store['network_edges'] = network_edges
+                store['network_version'] = version
+            staged = {}
+    finally:
+        for staging in staged.values():
+            ingest.remove_path(staging)
+    for key in parsed:
+        ingest.remove_path(ingest.export_path(drop, key))
+        outcomes.append({'export': '/'.join(key[1:]), 'status': 'ingested', 'detail': ''})
+    _log_ingest(store, outcomes)
+    return {key: signature for key, signature in scan.items() if key not in ready}
+
+def _ingest_loop(data_dir, drop, interval):
+    pending = {}
+    while True:
+        try:
+            pending = ingest_drop(data_dir, drop, pending)
+        except Exception as e:
+            _log_ingest(_dataset_store(data_dir), [{'export': drop, 'status': 'error', 'detail': f"{type(e).__name__}: {e}"}])
+            pending = {}
+        time.sleep(interval)
+
+# With APP_DROP_DIR set, start a background thread (once per process) that ingests exports dropped there into
+# data_dir every APP_DROP_INTERVAL seconds. Off when a season bundle is active: rebuild the bundle instead.
+def start_ingest(data_dir):
+    drop = ingest.drop_dir()
+    if not drop or _serving_bundle(_dataset_store(data_dir)):
+        return None
+    store = _dataset_store(data_dir)
+    with store['lock']:
+        if store['ingest'] is not None:
+            return store['ingest']
+        os.makedirs(drop, exist_ok=True)
+        store['ingest'] = threading.Thread(
+            target=_ingest_loop, args=(data_dir, drop, ingest.drop_interval()), name='dataset-ingest', daemon=True,
+        )
+    store['ingest'].start()
+    return store['ingest']
+
+# Mark the numpy arrays of a cached result (a dict of arrays and frames) read-only, so writes raise immediately
+def read_only(result):
+    for value in result.values():
+        if isinstance(value, np.ndarray):
+            value.flags.writeable = False
+    return result
+
+def guard_enabled():
+    return os.environ.get(GUARD_ENV_VAR, '') not in ('', '0')
+
+# Content hash of a shared value: frames and arrays are hashed by value, containers recursively
+def fingerprint(value):
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        columns = tuple(map(str, value.columns)) if isinstance(value, pd.DataFrame) else ()
+        return (columns, len(value), int(pd.util.hash_pandas_object(value).sum()))
+    if isinstance(value, np.ndarray):
+        return (value.shape, hashlib.sha1(np.ascontiguousarray(value).tobytes()).hexdigest())
+    if isinstance(value, dict):
+        return tuple(sorted((repr(key), fingerprint(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(fingerprint(item) for item in value)
+    return repr(value)
+
+# Every value the store shares with sessions, keyed by where it lives
+def shared_entries(store):
+    entries = {}
+    for name, frame in store['season_frames'].items():
+        entries[('season_frames', name)] = frame
+    for key in ['throw_counts', 'player_cube', 'network_edges', 'lineups']:
+        if store[key] is not None:
+            entries[(key,)] = store[key]
+    for game, index in store['possession_indexes'].items():
+        entries[('possession_indexes', game)] = index
+    for name, (_, cache) in store['selection_caches'].items():
+        for key, result in cache.items():
+            entries[('selection_caches', name, key)] = result
+    return entries
+
+# With APP_GUARD_SHARED=1, raise SharedDataMutated if a shared value changed since the last check while still being
+# the published object. Call after each rerun; values published during the rerun are recorded for the next check.
+def check_shared_data(data_dir):
+    if not guard_enabled():
+        return
+    store = _dataset_store(data_dir)
+    with store['lock']:
+        previous = store['fingerprints']
+        checked = {}
+        for key, value in shared_entries(store).items():
+            current = fingerprint(value)
+            if key in previous and previous[key][0] is value and previous[key][1] != current:
+                raise SharedDataMutated(f"Shared dataset entry {key} was modified in place; views must not write to shared data")
+            checked[key] = (value, current)
+        store['fingerprints'] = checked
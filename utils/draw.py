@@ -1,12 +1,15 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.colors
 
+from utils.field import ENDZONE_DEPTH, FIELD_LENGTH, FIELD_WIDTH, norm_to_field_x, norm_to_field_y, throw_coordinates
 
-FIELD_LENGTH = 110  # total length (including both endzones)
-FIELD_WIDTH = 40    # width (sideline to sideline)
-ENDZONE_DEPTH = 20  # each endzone
+
+GL_THROW_THRESHOLD = 1000  # draw throws with WebGL traces above this many throws
+LOD_THROW_THRESHOLD = 400  # "Auto" field charts aggregate into zones above this many throws
+FIELD_CHART_MODES = ["Auto", "Throws", "Start density", "End density", "Flow", "Completion %"]
 
 def show_custom_legend():
     legend_fig = go.Figure()
@@ -131,11 +134,179 @@ def draw_field():
     )
     return fig
 
-def norm_to_field_x(x_norm):
-    # x_norm: 0 (left sideline) to 1 (right sideline)
-    return x_norm * FIELD_WIDTH
+# Hover text per throw, e.g. "Thrower: A<br>Receiver: B<br>Possession: 2"
+def throw_hover_text(df, columns):
+    text = None
+    for label, column in columns:
+        part = f"{label}: " + df[column].astype(str)
+        text = part if text is None else text + "<br>" + part
+    return text
+
+# Drawing style used by the pass and possession charts: square at the thrower, circle at the receiver.
+# Throwaways get a large red square and no end marker; drops get a large red circle.
+def outcome_throw_styles(df, line_color=None, hover_columns=(("Thrower", "Thrower"), ("Receiver", "Receiver"))):
+    throws = throw_coordinates(df)
+    turnover = df['Turnover?'] == 1
+    throwaway = turnover & (df['Thrower error?'] == 1)
+    drop = turnover & ~throwaway & (df['Receiver error?'] == 1)
+    color = line_color if line_color is not None else pd.Series(np.where(turnover, "red", "green"), index=df.index)
+
+    throws['line_color'] = color.where(~(throwaway | drop), "red")
+    throws['start_symbol'] = "square"
+    throws['start_color'] = color.where(~throwaway, "red")
+    throws['start_size'] = np.where(throwaway, 16, 10)
+    throws['end_symbol'] = "circle"
+    throws['end_color'] = color.where(~drop, "red")
+    throws['end_size'] = np.where(throwaway, 0, np.where(drop, 16, 12))
+    throws['hover'] = throw_hover_text(df, hover_columns)
+    return throws
+
+# Drawing style used by the endzone chart: small circles, with a large square on the side that erred
+def error_throw_styles(df, hover_columns=(("Thrower", "Thrower"), ("Receiver", "Receiver"))):
+    throws = throw_coordinates(df)
+    turnover = df['Turnover?'] == 1
+    color = pd.Series(np.where(turnover, "red", "green"), index=df.index)
+    thrower_error = turnover & (df['Thrower error?'] == 1)
+    receiver_error = turnover & (df['Receiver error?'] == 1)
+
+    throws['line_color'] = color
+    throws['start_symbol'] = np.where(thrower_error, "square", "circle")
+    throws['start_color'] = color
+    throws['start_size'] = np.where(thrower_error, 15, 3)
+    throws['end_symbol'] = np.where(receiver_error, "square", "circle")
+    throws['end_color'] = color
+    throws['end_size'] = np.where(receiver_error, 15, 3)
+    throws['hover'] = throw_hover_text(df, hover_columns)
+    return throws
+
+# x/y arrays for many line segments in one trace: start, end, gap, start, end, gap, ...
+def segment_arrays(start, end):
+    values = np.full(len(start) * 3, np.nan)
+    values[0::3] = start
+    values[1::3] = end
+    return values
+
+# Draw a frame of throw styles onto a field figure with a handful of traces:
+# one line trace per colour, one trace each for start and end markers, and one for arrowheads.
+# Switches to WebGL traces when there are more than gl_threshold throws.
+def add_throws(fig, throws, arrows=False, outline=True, gl_threshold=GL_THROW_THRESHOLD):
+    if throws.empty:
+        return fig
+    scatter = go.Scattergl if len(throws) > gl_threshold else go.Scatter
+    marker_line = dict(width=1, color="black") if outline else dict(width=0)
+
+    for color, group in throws.groupby('line_color', sort=False):
+        fig.add_trace(scatter(
+            x=segment_arrays(group['sx'].to_numpy(), group['ex'].to_numpy()),
+            y=segment_arrays(group['sy'].to_numpy(), group['ey'].to_numpy()),
+            mode="lines",
+            line=dict(color=color, width=2),
+            hoverinfo="skip",
+            showlegend=False
+        ))
+
+    if arrows:
+        # Arrowheads as markers rotated along the throw (angle is clockwise from up)
+        fig.add_trace(scatter(
+            x=throws['ex'],
+            y=throws['ey'],
+            mode="markers",
+            marker=dict(symbol="arrow", angle=throws['angle'], size=12, color=throws['line_color'], opacity=0.7),
+            hoverinfo="skip",
+            showlegend=False
+        ))
+
+    fig.add_trace(scatter(
+        x=throws['sx'],
+        y=throws['sy'],
+        mode="markers",
+        marker=dict(symbol=throws['start_symbol'], color=throws['start_color'], size=throws['start_size'], line=marker_line),
+        text=throws['hover'],
+        hoverinfo="text",
+        showlegend=False
+    ))
+
+    ends = throws[throws['end_size'] > 0]
+    fig.add_trace(scatter(
+        x=ends['ex'],
+        y=ends['ey'],
+        mode="markers",
+        marker=dict(symbol=ends['end_symbol'], color=ends['end_color'], size=ends['end_size'], line=marker_line),
+        text=ends['hover'],
+        hoverinfo="text",
+        showlegend=False
+    ))
+    return fig
+
+# Field chart selector shared by the pass views. "Auto" draws individual throws up to
+# LOD_THROW_THRESHOLD and switches to a start-zone density heatmap above it.
+def field_chart_mode(num_throws, key):
+    mode = st.radio("Field chart", FIELD_CHART_MODES, horizontal=True, key=key)
+    if mode == "Auto":
+        mode = "Throws" if num_throws <= LOD_THROW_THRESHOLD else "Start density"
+        if mode != "Throws":
+            st.caption(f"{num_throws} throws selected; showing zone aggregates. Pick 'Throws' to draw every throw.")
+    return mode
+
+# Zone values (indexed [y zone, x zone]) as a heatmap over the field
+def add_zone_heatmap(fig, z, x_edges, y_edges, title, colorscale="Blues", zmin=None, zmax=None, text=None):
+    x_centers = (x_edges[:-1] + x_edges[1:]) / 2
+    y_centers = (y_edges[:-1] + y_edges[1:]) / 2
+    fig.add_trace(go.Heatmap(
+        x=x_centers,
+        y=y_centers,
+        z=np.where(np.isnan(z), None, np.round(z, 1)),
+        text=text,
+        colorscale=colorscale,
+        zmin=zmin,
+        zmax=zmax,
+        opacity=0.75,
+        hoverongaps=False,
+        colorbar=dict(title=title, len=0.5),
+        hovertemplate="%{z}" + ("<br>%{text}" if text is not None else "") + "<extra></extra>",
+    ))
+    return fig
+
+# Mean throw vector per start zone as arrows from the zone centre, sized by throw count
+def add_flow_arrows(fig, counts, mean_dx, mean_dy, x_edges, y_edges):
+    x_centers = (x_edges[:-1] + x_edges[1:]) / 2
+    y_centers = (y_edges[:-1] + y_edges[1:]) / 2
+    cx, cy = np.meshgrid(x_centers, y_centers)
+    has_throws = counts > 0
+    sx, sy = cx[has_throws], cy[has_throws]
+    ex, ey = sx + mean_dx[has_throws], sy + mean_dy[has_throws]
+    n = counts[has_throws]
+    if n.size == 0:
+        return fig
 
-def norm_to_field_y(y_norm):
-    # y_norm: 0 (back of opponent endzone) to 1 (back of own endzone)
-    # To flip the direction, invert the y axis: 0 (back of own endzone) to 1 (back of opponent endzone)
-    return (1 - y_norm) * FIELD_LENGTH
+    fig.add_trace(go.Scatter(
+        x=segment_arrays(sx, ex),
+        y=segment_arrays(sy, ey),
+        mode="lines",
+        line=dict(color="royalblue", width=2),
+        hoverinfo="skip",
+        showlegend=False
+    ))
+    fig.add_trace(go.Scatter(
+        x=ex,
+        y=ey,
+        mode="markers",
+        marker=dict(
+            symbol="arrow",
+            angle=np.degrees(np.arctan2(ex - sx, ey - sy)),
+            size=8 + 10 * np.sqrt(n / n.max()),
+            color="royalblue",
+        ),
+        hoverinfo="skip",
+        showlegend=False
+    ))
+    fig.add_trace(go.Scatter(
+        x=sx,
+        y=sy,
+        mode="markers",
+        marker=dict(symbol="circle", size=5, color="royalblue"),
+        text=[f"{int(c)} throws<br>Mean gain: {dy:.1f} yd" for c, dy in zip(n, ey - sy)],
+        hoverinfo="text",
+        showlegend=False
+    ))
+    return fig
@@ -0,0 +1,140 @@
+import os
+
+import pandas as pd
+
+from utils.schema import apply_schema
+
+
+BACKEND_ENV_VAR = 'APP_BACKEND'          # 'pandas' (default) or 'duckdb'
+DUCKDB_PATH_ENV_VAR = 'APP_DUCKDB_PATH'  # database file the season tables are persisted to
+DEFAULT_DUCKDB_PATH = 'season.duckdb'
+BACKENDS = ['pandas', 'duckdb']
+# Season tables registered in the database
+SQL_TABLES = ["Passes", "Points", "Possessions", "Player Stats", "Defensive Blocks"]
+GAME_COLUMNS = ['tournament', 'game']
+ROW_COLUMN = '_row'          # season row order, so query results come back in the same order as the pandas path
+VERSION_TABLE = '_dataset'   # data version the stored tables were built from
+GAMES_TABLE = '_games'       # (tournament, game) pairs of that version in display order
+STAGING_PREFIX = '_next_'    # tables being written for the next version
+
+
+# Whether the optional duckdb package can be imported
+def duckdb_available():
+    try:
+        import duckdb  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+# Backend requested through APP_BACKEND; unknown values fall back to pandas
+def requested_backend():
+    backend = os.environ.get(BACKEND_ENV_VAR, 'pandas').lower()
+    return backend if backend in BACKENDS else 'pandas'
+
+# Backend used for table queries: duckdb when requested and installed, otherwise pandas
+def active_backend():
+    return 'duckdb' if requested_backend() == 'duckdb' and duckdb_available() else 'pandas'
+
+def duckdb_path():
+    return os.environ.get(DUCKDB_PATH_ENV_VAR, DEFAULT_DUCKDB_PATH)
+
+# Open (or create) the database file; duckdb is only imported when this backend is used
+def connect(path=None):
+    import duckdb
+    return duckdb.connect(path or duckdb_path())
+
+def quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+# Data version the database tables were built from, or None for a new file (or one written before the games table)
+def stored_version(con):
+    found = con.execute(
+        "SELECT count(*) FROM information_schema.tables WHERE table_name IN (?, ?)", [VERSION_TABLE, GAMES_TABLE]
+    ).fetchone()[0]
+    if found < 2:
+        return None
+    row = con.execute(f"SELECT version FROM {VERSION_TABLE}").fetchone()
+    return row[0] if row else None
+
+# Write the season frames to the database unless it already holds this data version (e.g. after a restart).
+# (tournament, game) become columns so selections can be pushed down as predicates; `games` lists the
+# (tournament, game) pairs in display order (default: the order of the season frames). The tables are written
+# under staging names first and renamed over the old ones in one short transaction, so queries running
+# meanwhile keep reading the previous version.
+def sync_tables(con, season_frames, version, games=None):
+    cursor = con.cursor()
+    try:
+        if stored_version(cursor) == version:
+            return False
+        if games is None:
+            games = sorted(set().union(*(frame.index.unique() for frame in season_frames.values())))
+        tables = {GAMES_TABLE: pd.DataFrame(list(games), columns=GAME_COLUMNS).rename_axis('position').reset_index()}
+        for name in SQL_TABLES:
+            if name in season_frames:
+                frame = season_frames[name].reset_index()
+                frame.insert(0, ROW_COLUMN, range(len(frame)))
+                tables[name] = frame
+        try:
+            for name, frame in tables.items():
+                cursor.register('season_frame', frame)
+                cursor.execute(f"CREATE OR REPLACE TABLE {quote(STAGING_PREFIX + name)} AS SELECT * FROM season_frame")
+                cursor.unregister('season_frame')
+            cursor.execute("BEGIN TRANSACTION")
+            try:
+                for name in SQL_TABLES + [GAMES_TABLE]:
+                    cursor.execute(f"DROP TABLE IF EXISTS {quote(name)}")
+                    if name in tables:
+                        cursor.execute(f"ALTER TABLE {quote(STAGING_PREFIX + name)} RENAME TO {quote(name)}")
+                cursor.execute(f"CREATE OR REPLACE TABLE {VERSION_TABLE} (version VARCHAR)")
+                cursor.execute(f"INSERT INTO {VERSION_TABLE} VALUES (?)", [version])
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+        except Exception:
+            for name in tables:
+                cursor.execute(f"DROP TABLE IF EXISTS {quote(STAGING_PREFIX + name)}")
+            raise
+    finally:
+        cursor.close()
+    return True
+
+# {tournament: [games]} of the stored version, in display order
+def stored_games(con):
+    cursor = con.cursor()
+    try:
+        rows = cursor.execute(f"SELECT tournament, game FROM {GAMES_TABLE} ORDER BY position").fetchall()
+    finally:
+        cursor.close()
+    games = {}
+    for tournament, game in rows:
+        games.setdefault(tournament, []).append(game)
+    return games
+
+# Rows of a table for the selected (tournament, game) pairs with optional {column: value} filters, projected to
+# `columns`. The selection and filters run as SQL so only matching rows are converted back to pandas.
+def query_table(con, name, selected_games, filters=None, columns=None):
+    cursor = con.cursor()
+    try:
+        selected = pd.DataFrame(list(selected_games), columns=GAME_COLUMNS)
+        cursor.register('selected_games', selected)
+        projection = ', '.join(quote(column) for column in columns) if columns else f"* EXCLUDE ({ROW_COLUMN}, tournament, game)"
+        predicates = []
+        params = []
+        for column, value in (filters or {}).items():
+            predicates.append(f"t.{quote(column)} = ?")
+            # Selectbox values are often numpy scalars, which duckdb does not bind
+            params.append(value.item() if hasattr(value, 'item') else value)
+        where = f"WHERE {' AND '.join(predicates)}" if predicates else ''
+        df = cursor.execute(
+            f"SELECT {projection} FROM {quote(name)} t SEMI JOIN selected_games USING (tournament, game) "
+            f"{where} ORDER BY t.{ROW_COLUMN}",
+            params,
+        ).df()
+    finally:
+        cursor.close()
+    # ENUM columns come back as ordered categoricals; the pandas path has unordered ones
+    for column, values in df.items():
+        if isinstance(values.dtype, pd.CategoricalDtype) and values.cat.ordered:
+            df[column] = values.cat.as_unordered()
+    return apply_schema(df)
@@ -0,0 +1,35 @@
+from utils.field import ENDZONE_DEPTH, FIELD_LENGTH, START_Y
+
+
+RED_ZONE_YARDS = 20  # an endzone attempt starts once the disc is within this many yards of the endzone
+POSSESSION_KEYS = ['tournament_game', 'Point', 'Possession']
+POINT_KEYS = ['tournament_game', 'Point']
+
+
+# Normalized Start Y below which a throw starts inside the red zone
+def red_zone_start_y(red_zone_yards=RED_ZONE_YARDS):
+    return (ENDZONE_DEPTH + red_zone_yards) / FIELD_LENGTH
+
+# Throws of every possession from its first throw starting inside the red zone onwards,
+# ordered by (tournament_game, Point, Possession) and keeping the original row order within each possession
+def endzone_attempt_throws(passes_df, red_zone_yards=RED_ZONE_YARDS):
+    df = passes_df.sort_values(POSSESSION_KEYS, kind='stable')
+    in_red_zone = df[START_Y] < red_zone_start_y(red_zone_yards)
+    reached = in_red_zone.groupby([df[key] for key in POSSESSION_KEYS], observed=True).cummax()
+    return df[reached.fillna(False).astype(bool)]
+
+# One row per point with an endzone attempt: possessions from the red zone on, whether we scored,
+# and the outcome ('clean' = scored on the first attempt, 'dirty' = scored after a turnover, 'broken' = no score)
+def endzone_point_outcomes(attempt_throws):
+    scored = (attempt_throws['Assist?'] == 1).rename('Scored')
+    grouped = attempt_throws[POINT_KEYS + ['Possession']].assign(Scored=scored).groupby(POINT_KEYS, observed=True)
+    points = grouped.agg(Possessions=('Possession', 'nunique'), Scored=('Scored', 'max')).reset_index()
+    points['Outcome'] = 'broken'
+    points.loc[points['Scored'] & (points['Possessions'] == 1), 'Outcome'] = 'clean'
+    points.loc[points['Scored'] & (points['Possessions'] > 1), 'Outcome'] = 'dirty'
+    return points
+
+# Endzone attempt throws plus their per-point outcome table for a red zone of `red_zone_yards`
+def endzone_attempts(passes_df, red_zone_yards=RED_ZONE_YARDS):
+    attempt_throws = endzone_attempt_throws(passes_df, red_zone_yards)
+    return attempt_throws, endzone_point_outcomes(attempt_throws)
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+
+FIELD_LENGTH = 110  # total length (including both endzones)
+FIELD_WIDTH = 40    # width (sideline to sideline)
+ENDZONE_DEPTH = 20  # each endzone
+
+START_X = 'Start X (0 -> 1 = left sideline -> right sideline)'
+START_Y = 'Start Y (0 -> 1 = back of opponent endzone -> back of own endzone)'
+END_X = 'End X (0 -> 1 = left sideline -> right sideline)'
+END_Y = 'End Y (0 -> 1 = back of opponent endzone -> back of own endzone)'
+
+# Field-space columns added to Passes at load (yards, y = 0 at the back of our own endzone)
+FIELD_START_X = 'field_start_x'
+FIELD_START_Y = 'field_start_y'
+FIELD_END_X = 'field_end_x'
+FIELD_END_Y = 'field_end_y'
+THROW_LENGTH = 'throw_length'  # yards from start to end
+THROW_ANGLE = 'throw_angle'    # degrees clockwise from straight upfield, as used by Plotly marker angles
+FIELD_COLUMNS = [FIELD_START_X, FIELD_START_Y, FIELD_END_X, FIELD_END_Y, THROW_LENGTH, THROW_ANGLE]
+
+
+def norm_to_field_x(x_norm):
+    # x_norm: 0 (left sideline) to 1 (right sideline)
+    return x_norm * FIELD_WIDTH
+
+def norm_to_field_y(y_norm):
+    # y_norm: 0 (back of opponent endzone) to 1 (back of own endzone)
+    # To flip the direction, invert the y axis: 0 (back of own endzone) to 1 (back of opponent endzone)
+    return (1 - y_norm) * FIELD_LENGTH
+
+# Add field coordinates, throw length and angle to a Passes frame, vectorized over all throws
+def add_field_coordinates(passes_df):
+    sx = norm_to_field_x(passes_df[START_X].to_numpy(dtype=float))
+    sy = norm_to_field_y(passes_df[START_Y].to_numpy(dtype=float))
+    ex = norm_to_field_x(passes_df[END_X].to_numpy(dtype=float))
+    ey = norm_to_field_y(passes_df[END_Y].to_numpy(dtype=float))
+    dx, dy = ex - sx, ey - sy
+    return passes_df.assign(**{
+        FIELD_START_X: sx,
+        FIELD_START_Y: sy,
+        FIELD_END_X: ex,
+        FIELD_END_Y: ey,
+        THROW_LENGTH: np.hypot(dx, dy),
+        THROW_ANGLE: np.degrees(np.arctan2(dx, dy)),
+    })
+
+# Field coordinates and arrow angle of each throw, read from the columns added by add_field_coordinates()
+def throw_coordinates(df):
+    return pd.DataFrame({
+        'sx': df[FIELD_START_X],
+        'sy': df[FIELD_START_Y],
+        'ex': df[FIELD_END_X],
+        'ey': df[FIELD_END_Y],
+        'angle': df[THROW_ANGLE],
+    }, index=df.index)
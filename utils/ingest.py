@@ -0,0 +1,111 @@
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+
+from utils.bundle import swap_directory
+from utils.load_data import folder_manifest, load_game_folder
+from utils.statto import load_statto_archive
+
+
+DROP_DIR_ENV_VAR = 'APP_DROP_DIR'            # folder stat-takers drop new exports into; unset to disable ingestion
+DROP_INTERVAL_ENV_VAR = 'APP_DROP_INTERVAL'  # seconds between scans of the drop folder
+DEFAULT_DROP_INTERVAL = 5
+QUARANTINE_DIR = 'quarantine'                # inside the drop folder: rejected exports, each with a .error.txt
+REQUIRED_TABLES = ['Points', 'Passes']       # stat files every dropped game folder must contain
+
+
+class InvalidExport(ValueError):
+    pass
+
+
+def drop_dir():
+    return os.environ.get(DROP_DIR_ENV_VAR) or None
+
+def drop_interval():
+    value = os.environ.get(DROP_INTERVAL_ENV_VAR)
+    return max(0.1, float(value)) if value else DEFAULT_DROP_INTERVAL
+
+# Exports waiting in the drop folder with a signature of their files, so an export still being copied can be told
+# apart from a finished one. Game folders are <drop>/<tournament>/<game>/*.csv, keyed ('game', tournament, game);
+# archives are <drop>/*.statto, keyed ('archive', file name). Hidden entries and the quarantine are skipped.
+def scan_drop(drop):
+    exports = {}
+    for entry in os.scandir(drop):
+        if entry.name.startswith('.') or entry.name == QUARANTINE_DIR:
+            continue
+        if entry.is_file() and entry.name.endswith('.statto'):
+            stat = entry.stat()
+            exports[('archive', entry.name)] = (stat.st_size, stat.st_mtime_ns)
+        elif entry.is_dir():
+            for game_entry in os.scandir(entry.path):
+                if game_entry.is_dir() and not game_entry.name.startswith('.'):
+                    exports[('game', entry.name, game_entry.name)] = tuple(sorted(folder_manifest(game_entry.path).items()))
+    return exports
+
+def export_path(drop, key):
+    return os.path.join(drop, *key[1:])
+
+# Parse and validate one export: every CSV of a game folder must load and the REQUIRED_TABLES be present; an
+# archive must load and hold at least one game. Returns the game data (game folders) or the archive's
+# {tournament: {game: data}}; raises InvalidExport or the parser's error otherwise.
+def parse_export(drop, key):
+    path = export_path(drop, key)
+    if key[0] == 'archive':
+        archive = load_statto_archive(path)
+        if not any(archive.values()):
+            raise InvalidExport("archive contains no games")
+        return archive
+    _, tournament, game = key
+    game_data, errors = load_game_folder(tournament, game, folder_manifest(path))
+    if errors:
+        raise InvalidExport('; '.join(f"{os.path.basename(file_path)}: {e}" for file_path, e in errors))
+    missing = [table for table in REQUIRED_TABLES if table not in game_data]
+    if missing:
+        raise InvalidExport(f"missing stat files: {', '.join(missing)}")
+    return game_data
+
+# Where an export lives once installed in data_dir
+def installed_path(data_dir, key):
+    return os.path.join(data_dir, *key[1:])
+
+# Copy an export into data_dir under a hidden name that tournament_manifest() and archive_manifest() skip, so
+# the slow copy happens before the export becomes visible. Returns the staging path.
+def stage_export(data_dir, drop, key):
+    source = export_path(drop, key)
+    if key[0] == 'archive':
+        staging = os.path.join(data_dir, f".ingest-{key[1]}.part")
+        shutil.copy2(source, staging)
+        return staging
+    parent = os.path.join(data_dir, key[1])
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=f".ingest-{key[2]}-", dir=parent)
+    os.chmod(staging, 0o755)
+    shutil.copytree(source, staging, dirs_exist_ok=True)
+    return staging
+
+# Rename a staged export into place, replacing an earlier export of the same game or archive
+def install_export(data_dir, key, staging):
+    target = installed_path(data_dir, key)
+    if key[0] == 'archive':
+        os.replace(staging, target)
+    else:
+        swap_directory(staging, target)
+    return target
+
+def remove_path(path):
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    elif os.path.exists(path):
+        os.remove(path)
+
+# Move a rejected export to <drop>/quarantine/<UTC time>_<name> with the error next to it in <...>.error.txt.
+# Returns the quarantined name.
+def quarantine_export(drop, key, error):
+    quarantine = os.path.join(drop, QUARANTINE_DIR)
+    os.makedirs(quarantine, exist_ok=True)
+    name = f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}_{'_'.join(key[1:])}"
+    shutil.move(export_path(drop, key), os.path.join(quarantine, name))
+    with open(os.path.join(quarantine, f"{name}.error.txt"), 'w') as f:
+        f.write(f"{type(error).__name__}: {error}\n")
+    return name
@@ -0,0 +1,177 @@
+import heapq
+
+import numpy as np
+import pandas as pd
+
+
+# Combination metric -> (points it is measured on, outcome counted as a success)
+COMBINATION_METRICS = {
+    'Hold %': ('O points', 'Holds'),
+    'Clean hold %': ('O points', 'Clean holds'),
+    'Break %': ('D points', 'Breaks'),
+}
+
+
+# Point x player incidence matrix: one row per point of the Points table (in season order) and one boolean column
+# per player, True where the player's "Points played" list in Player Stats includes the point. The lists are
+# split and matched to point rows in one vectorized pass. Returns {'points', 'players', 'played'} where points
+# holds the (tournament, game) index, the outcome columns used by the on/off tables and 'recorded', False for
+# points that appear in no player's list (no lineup was recorded, so nobody counts as on or off for them).
+def build_lineup_incidence(player_stats_df, points_df):
+    points = pd.DataFrame({
+        'Point': points_df['Point'].to_numpy(),
+        'offense': points_df['Started on offense?'].to_numpy() == 1,
+        'scored': points_df['Scored?'].to_numpy() == 1,
+        'possessions': points_df['Possessions'].to_numpy(),
+    }, index=points_df.index)
+    players = pd.Index(sorted(player_stats_df['Player'].dropna().unique(), key=str), name='Player')
+    played = np.zeros((len(points), len(players)), dtype=bool)
+
+    lists = player_stats_df[player_stats_df['Player'].notna()]
+    # One entry per (player row, point played); the exploded index is the player row's position
+    point_numbers = pd.Series(lists['Points played'].astype(str).str.split(',').to_numpy()).explode()
+    position = point_numbers.index.to_numpy()
+    point_keys = pd.MultiIndex.from_arrays([
+        points.index.get_level_values('tournament'),
+        points.index.get_level_values('game'),
+        points['Point'],
+    ])
+    list_keys = pd.MultiIndex.from_arrays([
+        lists.index.get_level_values('tournament')[position],
+        lists.index.get_level_values('game')[position],
+        pd.to_numeric(point_numbers, errors='coerce').to_numpy(),
+    ])
+    rows = point_keys.get_indexer(list_keys)
+    columns = players.get_indexer(lists['Player'].to_numpy()[position])
+    found = rows >= 0
+    played[rows[found], columns[found]] = True
+    points['recorded'] = played.any(axis=1)
+    return {'points': points, 'players': players, 'played': played}
+
+# Incidence rows of the selected (tournament, game) pairs
+def select_lineup_incidence(incidence, selected_games):
+    rows = incidence['points'].index.isin(selected_games)
+    return {
+        'points': incidence['points'][rows],
+        'players': incidence['players'],
+        'played': incidence['played'][rows],
+    }
+
+# O points, holds, clean holds (scored on the first possession), D points and breaks, as arrays summed over the
+# rows in `weights` (points x k, e.g. the incidence matrix for one column per player, or a single mask column)
+def outcome_counts(points, weights):
+    weights = np.asarray(weights, dtype=float)
+    offense = points['offense'].to_numpy()
+    scored = points['scored'].to_numpy()
+    clean = scored & (points['possessions'].to_numpy() == 1)
+    return {
+        'O points': offense @ weights,
+        'Holds': (offense & scored) @ weights,
+        'Clean holds': (offense & clean) @ weights,
+        'D points': ~offense @ weights,
+        'Breaks': (~offense & scored) @ weights,
+    }
+
+# Percentage, NaN where there is nothing to divide by
+def rate(numerator, denominator):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.round(np.where(denominator > 0, numerator / denominator * 100, np.nan), 1)
+
+# Rates from outcome_counts() for the "on" and "off" sides
+def on_off_rates(on, off):
+    return {
+        'Hold % on': rate(on['Holds'], on['O points']),
+        'Hold % off': rate(off['Holds'], off['O points']),
+        'Clean hold % on': rate(on['Clean holds'], on['O points']),
+        'Clean hold % off': rate(off['Clean holds'], off['O points']),
+        'Break % on': rate(on['Breaks'], on['D points']),
+        'Break % off': rate(off['Breaks'], off['D points']),
+    }
+
+# Hold, clean-hold and break rates with each player on and off the field, for every player at once:
+# the "on" counts are one matrix product of the outcome vectors with the incidence matrix, "off" is total - on
+# over the points with a recorded lineup
+def player_on_off(incidence):
+    played = incidence['played']
+    on = outcome_counts(incidence['points'], played)
+    total = outcome_counts(incidence['points'], incidence['points'][['recorded']])
+    off = {name: total[name] - counts for name, counts in on.items()}
+    table = pd.DataFrame({
+        'Player': incidence['players'],
+        'Points on': played.sum(axis=0),
+        'O points on': on['O points'].astype(int),
+        'D points on': on['D points'].astype(int),
+        **on_off_rates(on, off),
+    })
+    table['Hold +/-'] = (table['Hold % on'] - table['Hold % off']).round(1)
+    table['Break +/-'] = (table['Break % on'] - table['Break % off']).round(1)
+    return table[table['Points on'] > 0].reset_index(drop=True)
+
+# Outcomes of points with every player of a set on the field against points with none of them on, among the
+# points with a recorded lineup
+def lineup_on_off(incidence, players):
+    columns = incidence['players'].get_indexer(players)
+    selected = incidence['played'][:, columns[columns >= 0]]
+    recorded = incidence['points']['recorded'].to_numpy()
+    masks = np.column_stack([selected.all(axis=1) & recorded, ~selected.any(axis=1) & recorded])
+    counts = outcome_counts(incidence['points'], masks)
+    table = pd.DataFrame({'Lineup': ['All on', 'None on'], 'Points': masks.sum(axis=0), **{name: values.astype(int) for name, values in counts.items()}})
+    table['Hold %'] = rate(table['Holds'], table['O points'])
+    table['Clean hold %'] = rate(table['Clean holds'], table['O points'])
+    table['Break %'] = rate(table['Breaks'], table['D points'])
+    return table
+
+# Python int with bit i set where mask[i] is True; & and int.bit_count() then intersect and count point sets
+def bitset(mask):
+    return int.from_bytes(np.packbits(np.asarray(mask, dtype=bool), bitorder='little').tobytes(), 'little')
+
+# Best `size`-player combinations by a COMBINATION_METRICS rate, over the points they all played together.
+# Players are bitsets of their points on the metric's side (O or D). A depth-first search extends combinations
+# in player order and prunes as soon as the shared points drop below min_points, since adding a player can only
+# shrink them. The best top_k combinations are kept in a heap (ties go to the larger sample).
+def top_lineup_combinations(incidence, size, metric='Hold %', min_points=10, top_k=20):
+    side, success = COMBINATION_METRICS[metric]
+    points = incidence['points']
+    offense = points['offense'].to_numpy()
+    scored = points['scored'].to_numpy()
+    # Only points with a recorded lineup can be shared by a combination, so the team rate is taken over them too
+    side_mask = (offense if side == 'O points' else ~offense) & points['recorded'].to_numpy()
+    success_mask = {
+        'Holds': offense & scored,
+        'Clean holds': offense & scored & (points['possessions'].to_numpy() == 1),
+        'Breaks': ~offense & scored,
+    }[success]
+    side_bits = bitset(side_mask)
+    success_bits = bitset(success_mask)
+    player_bits = [bitset(column) & side_bits for column in incidence['played'].T]
+    candidates = [i for i, bits in enumerate(player_bits) if bits.bit_count() >= min_points]
+
+    heap = []
+    def extend(combination, bits, start):
+        if len(combination) == size:
+            num_points = bits.bit_count()
+            successes = (bits & success_bits).bit_count()
+            item = (successes / num_points, num_points, successes, combination)
+            if len(heap) < top_k:
+                heapq.heappush(heap, item)
+            elif item[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, item)
+            return
+        for position in range(start, len(candidates)):
+            player = candidates[position]
+            shared = bits & player_bits[player]
+            if shared.bit_count() >= min_points:
+                extend(combination + (player,), shared, position + 1)
+    extend((), side_bits, 0)
+
+    best = sorted(heap, key=lambda item: item[:2], reverse=True)
+    team_rate = (success_mask & side_mask).sum() / side_mask.sum() * 100 if side_mask.any() else np.nan
+    players = incidence['players']
+    table = pd.DataFrame({
+        'Players': [' + '.join(str(players[i]) for i in combination) for *_, combination in best],
+        side: [num_points for _, num_points, _, _ in best],
+        success: [successes for _, _, successes, _ in best],
+        metric: [round(rate * 100, 1) for rate, *_ in best],
+    })
+    table['vs team'] = (table[metric] - team_rate).round(1)
+    return table
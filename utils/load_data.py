@@ -1,7 +1,14 @@
 import os
 import pandas as pd
 from collections import defaultdict
-import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.field import add_field_coordinates
+from utils.schema import apply_schema
+
+
+LOAD_WORKERS_ENV_VAR = 'APP_LOAD_WORKERS'
+DEFAULT_LOAD_WORKERS = 8
 
 
 # Utility to load top-level CSVs
@@ -13,50 +20,101 @@ def load_team_csvs(data_dir):
             team_data[data_file] = pd.read_csv(data_path)
     return team_data
 
-# Rename stat file keys for display simplicity
-def rename_stat_files(data):
-    for tournament in data:
-        for game in data[tournament]:
-            keys_to_rename = []
-            for old_key in list(data[tournament][game].keys()):
-                new_key = old_key.split(' vs.')[0]
-                data[tournament][game][new_key] = data[tournament][game].pop(old_key)
-
-# Utility to recursively load all CSVs in all tournament folders under data/
-def load_tournament_csvs(data_dir):
-    tournament_data = defaultdict(lambda: defaultdict(dict))
-    for tournament_folder in os.listdir(data_dir):
-        tournament_path = os.path.join(data_dir, tournament_folder)
-        if os.path.isdir(tournament_path):
-            for game_folder in os.listdir(tournament_path):
-                game_path = os.path.join(tournament_path, game_folder)
-                if os.path.isdir(game_path):
-                    for file in os.listdir(game_path):
-                        if file.endswith('.csv'):
-                            file_path = os.path.join(game_path, file)
-                            try:
-                                df = pd.read_csv(file_path)
-                                # If this is a Passes file, add the "tournament / game" column
-                                if file.lower().startswith("passes"):
-                                    tournament_game_str = f"{tournament_folder}_{game_folder}"
-
-                                    # Locate the corresponding Points file
-                                    points_file = next((f for f in os.listdir(game_path) if f.lower().startswith("points")), None)
-                                    if points_file:
-                                        points_path = os.path.join(game_path, points_file)
-                                        points_df = pd.read_csv(points_path)
-
-                                        # Extract relevant columns from Points file
-                                        columns_to_merge = ['Point', 'Our score at pull', "Opponent's score at pull", 'Started on offense?', 'Scored?']
-                                        if all(col in points_df.columns for col in columns_to_merge):
-                                            points_subset = points_df[columns_to_merge]
-
-                                            # Merge with Passes DataFrame
-                                            df = df.merge(points_subset, on='Point', how='left')
-
-                                    df["tournament_game"] = tournament_game_str
-                                tournament_data[tournament_folder][game_folder][file] = df
-                            except Exception as e:
-                                st.warning(f'Could not load {file_path}: {e}')
-    rename_stat_files(tournament_data)
-    return tournament_data
\ No newline at end of file
+# Stat file key used for display, e.g. "Passes vs. ESC ... .csv" -> "Passes"
+def stat_file_key(file):
+    return file.split(' vs.')[0]
+
+# (size, mtime) for every CSV directly inside a folder, keyed by file path
+def folder_manifest(folder_path):
+    manifest = {}
+    for entry in os.scandir(folder_path):
+        if entry.is_file() and entry.name.endswith('.csv'):
+            stat = entry.stat()
+            manifest[entry.path] = (stat.st_size, stat.st_mtime_ns)
+    return manifest
+
+# Per-game folder manifests for every tournament under data_dir, keyed by (tournament, game).
+# Hidden folders (e.g. games the ingest worker is still copying in) are skipped.
+def tournament_manifest(data_dir):
+    manifest = {}
+    for tournament_entry in os.scandir(data_dir):
+        if not tournament_entry.is_dir() or tournament_entry.name.startswith('.'):
+            continue
+        for game_entry in os.scandir(tournament_entry.path):
+            if game_entry.is_dir() and not game_entry.name.startswith('.'):
+                manifest[(tournament_entry.name, game_entry.name)] = folder_manifest(game_entry.path)
+    return manifest
+
+# (size, mtime) for every .statto archive directly inside data_dir, keyed by file path
+def archive_manifest(data_dir):
+    manifest = {}
+    for entry in os.scandir(data_dir):
+        if entry.is_file() and entry.name.endswith('.statto'):
+            stat = entry.stat()
+            manifest[entry.path] = (stat.st_size, stat.st_mtime_ns)
+    return manifest
+
+# Number of game folders parsed concurrently; APP_LOAD_WORKERS overrides the default
+def load_workers():
+    value = os.environ.get(LOAD_WORKERS_ENV_VAR)
+    return max(1, int(value)) if value else min(DEFAULT_LOAD_WORKERS, os.cpu_count() or 1)
+
+# Load every CSV of a single game folder, keyed by stat file name. Each file in the game's manifest is read
+# exactly once; Passes are merged with the already-parsed Points frame. Returns (game data, [(path, error)]).
+def load_game_folder(tournament_folder, game_folder, file_paths):
+    frames = {}
+    errors = []
+    for file_path in sorted(file_paths):
+        try:
+            frames[os.path.basename(file_path)] = pd.read_csv(file_path)
+        except Exception as e:
+            errors.append((file_path, e))
+
+    points_df = next((df for file, df in frames.items() if file.lower().startswith("points")), None)
+    columns_to_merge = ['Point', 'Our score at pull', "Opponent's score at pull", 'Started on offense?', 'Scored?']
+    game_data = {}
+    for file, df in frames.items():
+        try:
+            # If this is a Passes file, add the Points columns and the "tournament / game" column
+            if file.lower().startswith("passes"):
+                if points_df is not None and all(col in points_df.columns for col in columns_to_merge):
+                    df = df.merge(points_df[columns_to_merge], on='Point', how='left')
+                df["tournament_game"] = f"{tournament_folder}_{game_folder}"
+                df = add_field_coordinates(df)
+            game_data[stat_file_key(file)] = apply_schema(df)
+        except Exception as e:
+            errors.append((os.path.join(tournament_folder, game_folder, file), e))
+    return game_data, errors
+
+# Load game folders concurrently from their manifests ({(tournament, game): {path: stat}}). Returns
+# ({(tournament, game): game data}, {(tournament, game): [(path, error)]}); files that could not be loaded are
+# left out of the game data and listed in the errors.
+def load_game_folders(manifest, workers=None):
+    workers = workers or load_workers()
+    keys = sorted(manifest)
+
+    def load(key):
+        tournament, game = key
+        return load_game_folder(tournament, game, manifest[key])
+
+    if workers == 1 or len(keys) <= 1:
+        results = list(map(load, keys))
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(load, keys))
+
+    loaded = {}
+    errors = {}
+    for key, (game_data, game_errors) in zip(keys, results):
+        loaded[key] = game_data
+        if game_errors:
+            errors[key] = game_errors
+    return loaded, errors
+
+# Utility to load all CSVs in all tournament folders under data/, skipping files that cannot be loaded
+def load_tournament_csvs(data_dir, workers=None):
+    tournament_data = defaultdict(dict)
+    loaded, _ = load_game_folders(tournament_manifest(data_dir), workers)
+    for (tournament, game), game_data in loaded.items():
+        tournament_data[tournament][game] = game_data
+    return tournament_data
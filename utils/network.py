@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+
+METRES_TO_YARDS = 1.09361
+# Additive edge counts summed over the selected games
+EDGE_COLUMNS = ['attempts', 'completions', 'turnovers', 'yards_gained']
+
+
+# Sparse pass network: one row per game, thrower and receiver with attempts, completions, turnovers and
+# yards gained on completions. Players and games are factorized and (game, thrower, receiver) packed into one
+# integer key, so every count is a single bincount. Throws without a receiver (throwaways) are counted on a row
+# with no Receiver, which is no connection but keeps the thrower's throwaways next to the edges.
+# Rows are indexed by the (tournament, game) index levels of passes_df.
+def pass_network_edges(passes_df):
+    passes = passes_df[passes_df['Thrower'].notna()]
+    if passes.empty:
+        return pd.DataFrame(columns=['Thrower', 'Receiver'] + EDGE_COLUMNS, index=passes_df.index[:0])
+    game_codes, games = pd.factorize(passes.index)
+    num_passes = len(passes)
+    player_codes, players = pd.factorize(np.concatenate([
+        passes['Thrower'].to_numpy(dtype=object),
+        passes['Receiver'].to_numpy(dtype=object),
+    ]))
+    # Missing receivers get the last code, which names no player
+    players = np.append(np.asarray(players, dtype=object), None)
+    num_players = len(players)
+    player_codes = np.where(player_codes < 0, num_players - 1, player_codes)
+    thrower, receiver = player_codes[:num_passes], player_codes[num_passes:]
+    keys, inverse = np.unique((game_codes * num_players + thrower) * num_players + receiver, return_inverse=True)
+
+    completed = passes['Turnover?'].to_numpy() == 0
+    gained = np.where(completed, passes['Forward distance (m)'].to_numpy(dtype=float), 0.0) * METRES_TO_YARDS
+    return pd.DataFrame({
+        'Thrower': players[(keys // num_players) % num_players],
+        'Receiver': players[keys % num_players],
+        'attempts': np.bincount(inverse),
+        'completions': np.bincount(inverse, weights=completed).astype(int),
+        'turnovers': np.bincount(inverse, weights=~completed).astype(int),
+        'yards_gained': np.bincount(inverse, weights=gained),
+    }, index=games[keys // (num_players * num_players)].set_names(passes_df.index.names))
+
+# Thrower -> receiver connections summed over the given edge rows, with completion % and average gain,
+# most used connections first. A connection's turnovers are the incomplete throws to that receiver (thrower
+# errors and drops); 'thrower_throwaways' is the thrower's turnovers with no receiver, which belong to no connection.
+def pass_connections(edges):
+    if edges.empty:
+        columns = ['Thrower', 'Receiver', 'attempts', 'completions', 'turnovers', 'thrower_throwaways', 'yards_gained']
+        return pd.DataFrame(columns=columns + ['Completion %', 'Avg yards gained'])
+    received = edges['Receiver'].notna()
+    connections = edges[received].groupby(['Thrower', 'Receiver'], observed=True)[EDGE_COLUMNS].sum().reset_index()
+    throwaways = edges[~received].groupby('Thrower', observed=True)['turnovers'].sum()
+    connections['thrower_throwaways'] = connections['Thrower'].map(throwaways).fillna(0).astype(int)
+    attempts = connections['attempts'].where(connections['attempts'] > 0)
+    completions = connections['completions'].where(connections['completions'] > 0)
+    connections['Completion %'] = (connections['completions'] / attempts * 100).round(1).fillna(0.0)
+    connections['Avg yards gained'] = (connections['yards_gained'] / completions).round(1).fillna(0.0)
+    connections['yards_gained'] = connections['yards_gained'].round(1)
+    connections.insert(connections.columns.get_loc('turnovers') + 1, 'thrower_throwaways', connections.pop('thrower_throwaways'))
+    return connections.sort_values(['attempts', 'completions'], ascending=False, kind='stable').reset_index(drop=True)
+
+# Throws and catches attempted per player in the connections, for sizing the network nodes
+def player_involvement(connections):
+    thrown = connections.groupby('Thrower', observed=True)['attempts'].sum()
+    received = connections.groupby('Receiver', observed=True)['attempts'].sum()
+    involvement = thrown.add(received, fill_value=0).astype(int)
+    involvement.index.name = 'Player'
+    return involvement.sort_index(key=lambda players: players.astype(str))
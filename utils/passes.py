@@ -60,12 +60,6 @@ def show_passes(df):
     if point:
         df = df[df['Point'] == point]
 
-    # Prepare throw start and end points
-    start_x = df['Start X (0 -> 1 = left sideline -> right sideline)'].apply(norm_to_field_x)
-    start_y = df['Start Y (0 -> 1 = back of opponent endzone -> back of own endzone)'].apply(norm_to_field_y)
-    end_x = df['End X (0 -> 1 = left sideline -> right sideline)'].apply(norm_to_field_x)
-    end_y = df['End Y (0 -> 1 = back of opponent endzone -> back of own endzone)'].apply(norm_to_field_y)
-
     # Add throws as arrows
     for index, row in df.iterrows():
         sx = norm_to_field_x(row['Start X (0 -> 1 = left sideline -> right sideline)'])
@@ -210,12 +204,6 @@ def show_endzone_attempts(df):
         selected_tournament_game, selected_point = point_selection[1]
         df = df[(df['tournament_game'] == selected_tournament_game) & (df['Point'] == selected_point)]
 
-    # # Prepare throw start and end points
-    start_x = df['Start X (0 -> 1 = left sideline -> right sideline)'].apply(norm_to_field_x)
-    start_y = df['Start Y (0 -> 1 = back of opponent endzone -> back of own endzone)'].apply(norm_to_field_y)
-    end_x = df['End X (0 -> 1 = left sideline -> right sideline)'].apply(norm_to_field_x)
-    end_y = df['End Y (0 -> 1 = back of opponent endzone -> back of own endzone)'].apply(norm_to_field_y)
-
     # Add throws as arrows
     for index, row in df.iterrows():
         sx = norm_to_field_x(row['Start X (0 -> 1 = left sideline -> right sideline)'])
@@ -0,0 +1,102 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+
+PERF_ENV_VAR = 'APP_PERF'            # set to 1 to instrument every session
+PERF_QUERY_PARAM = 'perf'            # or open the app with ?perf=1
+PERF_LOG_ENV_VAR = 'APP_PERF_LOG'    # JSONL file the runs are appended to
+DEFAULT_PERF_LOG = 'perf_log.jsonl'
+
+# Each session's script runs in its own thread, so the current run is thread-local
+_local = threading.local()
+_log_lock = threading.Lock()
+
+
+# Whether instrumentation is switched on for this rerun
+def perf_enabled():
+    if os.environ.get(PERF_ENV_VAR, '') not in ('', '0'):
+        return True
+    try:
+        return st.query_params.get(PERF_QUERY_PARAM, '') not in ('', '0')
+    except Exception:
+        return False
+
+# Start recording a rerun; phases are only timed between this and finish_perf_run()
+def start_perf_run():
+    _local.run = {'start': time.perf_counter(), 'view': None, 'phases': []} if perf_enabled() else None
+    return _local.run
+
+# Name of the view being rendered, for the panel and the log
+def set_perf_view(view):
+    run = getattr(_local, 'run', None)
+    if run is not None:
+        run['view'] = view
+
+# Time a block of the current rerun, e.g. `with perf_phase('build figure', rows=len(df)):`. No-op when disabled.
+@contextmanager
+def perf_phase(name, rows=None):
+    run = getattr(_local, 'run', None)
+    if run is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        run['phases'].append({'phase': name, 'seconds': time.perf_counter() - start, 'rows': rows})
+
+# Record trace and annotation counts and the serialized size of a figure about to be rendered.
+# Serializing costs about as much as rendering, so this only runs when instrumentation is on.
+def record_figure(name, fig):
+    run = getattr(_local, 'run', None)
+    if run is None:
+        return
+    start = time.perf_counter()
+    json_bytes = len(fig.to_json())
+    run['phases'].append({
+        'phase': f"{name} figure JSON",
+        'seconds': time.perf_counter() - start,
+        'traces': len(fig.data),
+        'annotations': len(fig.layout.annotations or ()),
+        'json_bytes': json_bytes,
+    })
+
+# Append a finished run to the JSONL log
+def write_perf_log(record, path=None):
+    path = path or os.environ.get(PERF_LOG_ENV_VAR, DEFAULT_PERF_LOG)
+    with _log_lock, open(path, 'a') as f:
+        f.write(json.dumps(record) + '\n')
+
+# Close the current rerun: log it and show its phases in a collapsible sidebar panel
+def finish_perf_run():
+    run = getattr(_local, 'run', None)
+    _local.run = None
+    if run is None:
+        return None
+    ctx = get_script_run_ctx()
+    record = {
+        'time': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+        'session': ctx.session_id if ctx else None,
+        'view': run['view'],
+        'total_seconds': time.perf_counter() - run['start'],
+        'phases': run['phases'],
+    }
+    try:
+        write_perf_log(record)
+    except OSError as e:
+        st.sidebar.warning(f'Could not write performance log: {e}')
+
+    with st.sidebar.expander(f"Performance: {record['total_seconds'] * 1000:.0f} ms"):
+        phases = pd.DataFrame(run['phases'])
+        if not phases.empty:
+            phases['ms'] = (phases.pop('seconds') * 1000).round(1)
+            st.dataframe(phases, hide_index=True)
+    return record
@@ -0,0 +1,27 @@
+import numpy as np
+
+
+# Checkbox key of a possession in the Possessions view
+def possession_key(point, possession):
+    return f"p{point}_pos{possession}"
+
+# Possession index of one game: its passes ordered by (Point, Possession) with a fresh index, and one row per
+# (Point, Possession) with the point's O/D flag, the possession's row range [start, stop) in those passes and its pass count
+def build_possession_index(game_df):
+    passes = game_df.sort_values(['Point', 'Possession'], kind='stable').reset_index(drop=True)
+    rows = passes[['Point', 'Possession']].assign(row=np.arange(len(passes)))
+    possessions = rows.groupby(['Point', 'Possession']).agg(start=('row', 'min'), stop=('row', 'max'), passes=('row', 'size'))
+    possessions['stop'] += 1
+    point_offense = passes.groupby('Point')['Started on offense?'].first()
+    possessions['offense'] = possessions.index.get_level_values('Point').map(point_offense).to_numpy()
+    return passes, possessions
+
+# Possession indexes for every game of a season Passes frame, keyed by tournament_game
+def build_possession_indexes(passes_df):
+    return {game: build_possession_index(game_df) for game, game_df in passes_df.groupby('tournament_game', sort=False, observed=True)}
+
+# Passes of the selected (Point, Possession) pairs, in selection order
+def select_possessions(passes, possessions, selected):
+    ranges = possessions.loc[selected, ['start', 'stop']].to_numpy()
+    rows = np.concatenate([np.arange(start, stop) for start, stop in ranges])
+    return passes.iloc[rows]
@@ -0,0 +1,52 @@
+import pandas as pd
+
+from utils.field import FIELD_COLUMNS
+
+
+# Player and game identifiers, stored as categoricals
+CATEGORY_COLUMNS = [
+    'Thrower', 'Receiver', 'Player', 'Initiator',
+    'Secondary assist', 'Assist', 'Goal', 'Thrower error', 'Receiver error',
+    'tournament_game',
+]
+# Per-throw distances and field coordinates, stored as float32 together with every normalized "(0 -> 1 ...)" coordinate column.
+# Player Stats distance totals stay float64 so their sums round exactly as before.
+FLOAT32_COLUMNS = ['Distance (m)', 'Forward distance (m)', 'Left-to-right distance (m)'] + FIELD_COLUMNS
+
+
+# Whether a column is a 0/1 flag such as "Turnover?" or "Scored?" without missing values
+def is_flag_column(column, values):
+    if not column.endswith('?') or not pd.api.types.is_numeric_dtype(values):
+        return False
+    values = values.to_numpy()
+    # NaN fails both comparisons, so flags with missing values are left alone
+    return bool(((values == 0) | (values == 1)).all())
+
+# Compact dtypes for a loaded stat table: categoricals for identifiers, int8 for flags, float32 for coordinates
+# and per-throw distances. Columns that do not fit a type (e.g. flags with missing values) keep their dtype.
+# Columns are converted as arrays and assembled once, which is several times faster than DataFrame.astype(dict).
+def apply_schema(df):
+    columns = {}
+    for column, values in df.items():
+        if column in CATEGORY_COLUMNS:
+            if not isinstance(values.dtype, pd.CategoricalDtype):
+                values = pd.Categorical(values)
+        elif is_flag_column(column, values):
+            values = values.to_numpy().astype('int8')
+        elif (column in FLOAT32_COLUMNS or '(0 -> 1' in column) and pd.api.types.is_float_dtype(values):
+            values = values.to_numpy().astype('float32')
+        columns[column] = values
+    return pd.DataFrame(columns, index=df.index)
+
+# Rows, columns and in-memory size (MB, including string contents) of each table
+def memory_report(tables):
+    report = pd.DataFrame([
+        {
+            'Table': name,
+            'Rows': len(df),
+            'Columns': len(df.columns),
+            'Memory (MB)': round(df.memory_usage(deep=True).sum() / 1e6, 3),
+        }
+        for name, df in tables.items()
+    ])
+    return report
@@ -0,0 +1,136 @@
+import numpy as np
+
+from utils.field import FIELD_END_X, FIELD_END_Y, FIELD_LENGTH, FIELD_START_X, FIELD_START_Y, FIELD_WIDTH, throw_coordinates
+
+
+ZONE_SIZE = 5  # yards per zone side
+ZONE_SIZES = [2, 4, 5, 8, 10]  # grid resolutions offered by the Field Zones view
+# Passes columns zone_stats() needs, for projecting queries
+ZONE_STAT_COLUMNS = [FIELD_START_X, FIELD_START_Y, FIELD_END_X, FIELD_END_Y, 'Turnover?']
+# Zone metric -> colorbar title, colorscale and fixed range
+ZONE_METRICS = {
+    "Attempts": ("Throws", "Blues", None, None),
+    "Completion %": ("Completion %", "RdYlGn", 0, 100),
+    "Turnovers": ("Turnovers", "Reds", None, None),
+    "Turnover %": ("Turnover %", "Reds", 0, 100),
+    "Yards gained": ("Yards gained", "Greens", None, None),
+    "Avg yards gained": ("Yards / completion", "Greens", None, None),
+}
+
+
+# Zone edges across (x) and along (y) the field for a given zone size in yards
+def zone_edges(zone_size=ZONE_SIZE):
+    x_edges = np.linspace(0, FIELD_WIDTH, int(np.ceil(FIELD_WIDTH / zone_size)) + 1)
+    y_edges = np.linspace(0, FIELD_LENGTH, int(np.ceil(FIELD_LENGTH / zone_size)) + 1)
+    return x_edges, y_edges
+
+# Flat zone number (y zone * number of x zones + x zone) of field points on an evenly spaced grid, plus a mask of
+# the points that have one. Points outside the field go to the nearest edge zone; points with a missing
+# (non-finite) coordinate fall in no zone.
+def zone_indices(x, y, x_edges, y_edges):
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    valid = np.isfinite(x) & np.isfinite(y)
+    nx, ny = len(x_edges) - 1, len(y_edges) - 1
+    ix = np.clip(np.floor(np.where(valid, x, 0) / (x_edges[-1] / nx)), 0, nx - 1).astype(int)
+    iy = np.clip(np.floor(np.where(valid, y, 0) / (y_edges[-1] / ny)), 0, ny - 1).astype(int)
+    return iy * nx + ix, valid
+
+# Binning engine shared by every zone aggregate: the zone numbers of the points are computed once and
+# count(weights=None) sums weights (or counts points) per zone with one bincount. Results are indexed
+# [y zone, x zone] to match go.Heatmap's z; points without a zone are left out.
+def zone_counter(x, y, x_edges, y_edges):
+    zones, valid = zone_indices(x, y, x_edges, y_edges)
+    zones = zones[valid]
+    shape = (len(y_edges) - 1, len(x_edges) - 1)
+
+    def count(weights=None):
+        if weights is not None:
+            weights = np.asarray(weights, dtype=float)[valid]
+        return np.bincount(zones, weights=weights, minlength=shape[0] * shape[1]).reshape(shape)
+
+    return count
+
+# Count (or sum of weights) of field points per zone
+def bin_points(x, y, x_edges, y_edges, weights=None):
+    return zone_counter(x, y, x_edges, y_edges)(weights)
+
+# Number of throws starting (or ending) in each zone
+def throw_density(df, at='start', zone_size=ZONE_SIZE):
+    x_edges, y_edges = zone_edges(zone_size)
+    coords = throw_coordinates(df)
+    prefix = 's' if at == 'start' else 'e'
+    counts = bin_points(coords[prefix + 'x'], coords[prefix + 'y'], x_edges, y_edges)
+    return counts, x_edges, y_edges
+
+# Mean throw vector (yards) from each start zone, plus the number of throws it averages. Throws without an end
+# position have no vector and are left out.
+def zone_flow(df, zone_size=ZONE_SIZE):
+    x_edges, y_edges = zone_edges(zone_size)
+    coords = throw_coordinates(df)
+    coords = coords[np.isfinite(coords[['ex', 'ey']].to_numpy(dtype=float)).all(axis=1)]
+    count = zone_counter(coords['sx'], coords['sy'], x_edges, y_edges)
+    counts = count()
+    sum_dx = count(coords['ex'] - coords['sx'])
+    sum_dy = count(coords['ey'] - coords['sy'])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_dx = np.where(counts > 0, sum_dx / counts, np.nan)
+        mean_dy = np.where(counts > 0, sum_dy / counts, np.nan)
+    return counts, mean_dx, mean_dy, x_edges, y_edges
+
+# Attempts, completions, turnovers and yards gained on completions per zone, binned by where throws start
+# (or end). Completions without an end position count as attempts but gain no yards.
+def zone_stats(df, zone_size=ZONE_SIZE, at='start'):
+    x_edges, y_edges = zone_edges(zone_size)
+    x_column, y_column = (FIELD_START_X, FIELD_START_Y) if at == 'start' else (FIELD_END_X, FIELD_END_Y)
+    count = zone_counter(df[x_column].to_numpy(), df[y_column].to_numpy(), x_edges, y_edges)
+    completed = df['Turnover?'].to_numpy() == 0
+    gained = df[FIELD_END_Y].to_numpy(dtype=float) - df[FIELD_START_Y].to_numpy(dtype=float)
+    return {
+        'attempts': count(),
+        'completions': count(completed),
+        'turnovers': count(~completed),
+        'yards_gained': count(np.where(completed & np.isfinite(gained), gained, 0.0)),
+        'x_edges': x_edges,
+        'y_edges': y_edges,
+    }
+
+# Values of a ZONE_METRICS metric per zone (NaN where it is undefined) and hover text with the counts behind it
+def zone_metric(stats, metric):
+    attempts, completions, turnovers = stats['attempts'], stats['completions'], stats['turnovers']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        values = {
+            "Attempts": attempts,
+            "Completion %": completions / attempts * 100,
+            "Turnovers": turnovers,
+            "Turnover %": turnovers / attempts * 100,
+            "Yards gained": stats['yards_gained'],
+            "Avg yards gained": stats['yards_gained'] / completions,
+        }[metric]
+    values = np.where(attempts > 0, values, np.nan)
+    text = [
+        [f"{int(a)} throws, {int(c)} completed, {int(t)} turnovers" for a, c, t in zip(a_row, c_row, t_row)]
+        for a_row, c_row, t_row in zip(attempts, completions, turnovers)
+    ]
+    return values, text
+
+# Heatmap of one zone metric over the field. The figure helpers (and Plotly) are imported on first use, so the
+# dataset layer can use the zone aggregates without loading them.
+def add_zone_metric(fig, stats, metric):
+    from utils.draw import add_zone_heatmap
+    title, colorscale, zmin, zmax = ZONE_METRICS[metric]
+    values, text = zone_metric(stats, metric)
+    return add_zone_heatmap(fig, values, stats['x_edges'], stats['y_edges'], title=title, colorscale=colorscale, zmin=zmin, zmax=zmax, text=text)
+
+# Draw the aggregated field chart for a mode picked with field_chart_mode()
+def add_zone_chart(fig, df, mode, zone_size=ZONE_SIZE):
+    from utils.draw import add_flow_arrows, add_zone_heatmap
+    if mode in ("Start density", "End density"):
+        counts, x_edges, y_edges = throw_density(df, at='start' if mode == "Start density" else 'end', zone_size=zone_size)
+        add_zone_heatmap(fig, np.where(counts > 0, counts, np.nan), x_edges, y_edges, title="Throws")
+    elif mode == "Flow":
+        counts, mean_dx, mean_dy, x_edges, y_edges = zone_flow(df, zone_size)
+        add_flow_arrows(fig, counts, mean_dx, mean_dy, x_edges, y_edges)
+    elif mode == "Completion %":
+        add_zone_metric(fig, zone_stats(df, zone_size), "Completion %")
+    return fig
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+
+# Indicator columns summed per group by the throwing and receiving tables
+def pass_indicators(passes_df):
+    completed = passes_df['Turnover?'] == 0
+    huck = passes_df['Huck?'] == 1
+    short = passes_df['Huck?'] == 0
+    endzone = passes_df['Throw to endzone?'] == 1
+    sideline = passes_df['From sideline?'] == 1
+    center = passes_df['From sideline?'] == 0
+    return pd.DataFrame({
+        'attempts': np.ones(len(passes_df), dtype=int),
+        'completions': completed,
+        'huck_attempts': huck,
+        'huck_completions': huck & completed,
+        'short_attempts': short,
+        'short_completions': short & completed,
+        'endzone_attempts': endzone,
+        'endzone_completions': endzone & completed,
+        'sideline_attempts': sideline,
+        'sideline_completions': sideline & completed,
+        'center_attempts': center,
+        'center_completions': center & completed,
+        'drops': (passes_df['Turnover?'] == 1) & (passes_df['Receiver error?'] == 1),
+    }, index=passes_df.index).astype(int)
+
+# Role of a player on a pass, keyed by the Passes column naming them
+PASS_ROLES = {'Thrower': 'thrower', 'Receiver': 'receiver'}
+# Completed-pass distance sums carried in the cube: Passes column -> cube column
+CUBE_DISTANCES = {'Distance (m)': 'completed_distance_m', 'Forward distance (m)': 'completed_gain_m'}
+
+# Additive per game x player x role aggregate of the pass indicators and completed distances. Built once per
+# dataset version so player tables sum the selected games' rows (games x players) instead of raw passes.
+# Rows are keyed by the (tournament, game) index levels of passes_df with 'Player' and 'Role' columns.
+def player_pass_cube(passes_df):
+    values = pass_indicators(passes_df)
+    completed = passes_df['Turnover?'].to_numpy() == 0
+    for column, name in CUBE_DISTANCES.items():
+        if column in passes_df.columns:
+            values[name] = np.where(completed, passes_df[column].to_numpy(dtype=float), 0.0)
+    games = [passes_df.index.get_level_values(level) for level in ['tournament', 'game']]
+    cubes = []
+    for column, role in PASS_ROLES.items():
+        cube = values.groupby(games + [passes_df[column].array], observed=True).sum()
+        cube.index.names = ['tournament', 'game', 'Player']
+        cubes.append(cube.reset_index('Player').assign(Role=role))
+    return pd.concat(cubes)
+
+# Cube rows of one role summed per player, reindexed to `players` with zero counts for players without passes
+def player_role_totals(cube, role, players=None):
+    rows = cube[cube['Role'] == role].drop(columns='Role')
+    totals = rows.groupby('Player', observed=True).sum()
+    if players is not None:
+        totals = totals.reindex(players, fill_value=0)
+    return totals
+
+# Percentage rounded to 2 decimals, 0.0 where the denominator is zero
+def completion_pct(numerator, denominator):
+    pct = (numerator / denominator.where(denominator > 0) * 100).round(2)
+    return pct.fillna(0.0)
+
+THROW_CATEGORIES = ['Huck?', 'Throw to endzone?', 'From sideline?']
+# Category name -> (flag column, flag value) for the throwing metrics; None is every throw
+THROW_CATEGORY_FLAGS = {
+    '': None,
+    'huck_': ('Huck?', 1),
+    'short_': ('Huck?', 0),
+    'endzone_': ('Throw to endzone?', 1),
+    'sideline_': ('From sideline?', 1),
+    'center_': ('From sideline?', 0),
+}
+
+# Tidy category x outcome counts: one row per observed combination of the `by` columns (or index levels),
+# the throw category flags and Turnover?, with the number of throws in 'Throws'
+def throw_outcome_counts(passes_df, by=()):
+    keys = list(by) + THROW_CATEGORIES + ['Turnover?']
+    counts = passes_df.groupby(keys, dropna=False, observed=True).size()
+    return counts.rename('Throws').reset_index()
+
+# Attempts, completions and turnovers per throw category, derived from throw_outcome_counts().
+# Grouped by the `by` columns, or a single 'Team Total' row when `by` is empty.
+def throwing_metrics(counts, by=()):
+    throws = counts['Throws'].to_numpy()
+    completed = (counts['Turnover?'] == 0).to_numpy()
+    turnover = (counts['Turnover?'] == 1).to_numpy()
+    columns = {}
+    for prefix, flag in THROW_CATEGORY_FLAGS.items():
+        in_category = (counts[flag[0]] == flag[1]).to_numpy() if flag else np.ones(len(counts), dtype=bool)
+        columns[prefix + 'attempts'] = np.where(in_category, throws, 0)
+        columns[prefix + 'completions'] = np.where(in_category & completed, throws, 0)
+        columns[prefix + 'turnovers'] = np.where(in_category & turnover, throws, 0)
+    metrics = pd.DataFrame(columns, index=counts.index)
+    if by:
+        return metrics.groupby([counts[column] for column in by], dropna=False, observed=True).sum()
+    return metrics.sum().to_frame('Team Total').T
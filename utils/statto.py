@@ -0,0 +1,404 @@
+import json
+import os
+import re
+import zipfile
+import numpy as np
+import pandas as pd
+
+from utils.field import add_field_coordinates
+from utils.schema import apply_schema
+
+
+# Statto pitch dimensions in metres (WFDF field, 18m endzones)
+PITCH_LENGTH_M = 100
+PITCH_WIDTH_M = 37
+ENDZONE_FRACTION = 0.18
+# Thresholds used by Statto's CSV export for the derived pass flags
+SIDELINE_FRACTION = 0.15
+SWING_MIN_LATERAL_FRACTION = 0.3
+SWING_MAX_FORWARD_M = 8
+DUMP_MIN_BACKWARD_M = 1
+
+START_X = 'Start X (0 -> 1 = left sideline -> right sideline)'
+START_Y = 'Start Y (0 -> 1 = back of opponent endzone -> back of own endzone)'
+END_X = 'End X (0 -> 1 = left sideline -> right sideline)'
+END_Y = 'End Y (0 -> 1 = back of opponent endzone -> back of own endzone)'
+LOCATION_X = 'Location X (0 -> 1 = left sideline -> right sideline)'
+LOCATION_Y = 'Location Y (0 -> 1 = back of opponent endzone -> back of own endzone)'
+
+PASSES_COLUMNS = [
+    'Created', 'Point', 'Possession', 'Thrower', 'Receiver', 'Turnover?', 'Thrower error?', 'Receiver error?',
+    'Throw to endzone?', 'Assist?', 'Secondary assist?', 'Huck?', 'Swing?', 'Dump?', 'From sideline?', 'To sideline?',
+    'Distance (m)', 'Forward distance (m)', 'Left-to-right distance (m)', START_X, START_Y, END_X, END_Y,
+]
+POINTS_COLUMNS = [
+    'Created', 'Point', 'Our score at pull', "Opponent's score at pull", 'Started on offense?', 'Scored?',
+    'Possessions', 'Passes', 'Turnovers', 'Thrower errors', 'Receiver errors', 'Defensive blocks',
+    'Opposition errors', 'Secondary assist', 'Assist', 'Goal',
+]
+POSSESSIONS_COLUMNS = [
+    'Created', 'Point', 'Possession', 'Started point on offense?', 'Scored?', START_X, START_Y, 'Initiator',
+    'Passes', 'Secondary assist', 'Assist', 'Goal', 'Thrower error', 'Receiver error', 'Stalled out',
+]
+DEFENSIVE_BLOCKS_COLUMNS = [
+    'Created', 'Point', 'Player', 'In own endzone?', "In opponent's endzone?", 'Stall out?', 'Callahan?',
+    LOCATION_X, LOCATION_Y,
+]
+STALL_OUTS_COLUMNS = ['Created', 'Point', 'Possession', 'Player', LOCATION_X, LOCATION_Y]
+PLAYER_STATS_COLUMNS = [
+    'Player', 'Points played total', 'Points played', 'Offense points played', 'Defense points played',
+    'Offense points won', 'Defense points won', 'Touches', 'Points played with touches', 'Throws', 'Catches',
+    'Possessions initiated', 'Assists', 'Secondary assists', 'Goals', 'Turnovers', 'Thrower errors',
+    'Receiver errors', 'Defensive blocks', 'Stall outs for', 'Stall outs against',
+    'Total completed throw distance (m)', 'Total completed throw gain (m)',
+    'Average completed throw distance (m)', 'Average completed throw gain (m)',
+    'Total caught pass distance (m)', 'Total caught pass gain (m)',
+    'Average caught pass distance (m)', 'Average caught pass gain (m)',
+]
+
+
+# Read data.json from a .statto archive; returns the whole export (metadata and teams)
+def read_statto_json(path):
+    with zipfile.ZipFile(path) as archive:
+        return json.loads(archive.read('data.json'))
+
+# UTC offset of the device the archive was exported on. The archive name holds the export time in local time
+# (e.g. Nemesis_2025_2025-09-04_17-46-25) and the metadata the same moment in UTC; None when either is missing.
+def export_utc_offset(export):
+    match = re.search(r'(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})$', export.get('filename') or '')
+    exported = (export.get('metadata') or {}).get('date')
+    if not match or not exported:
+        return None
+    local = pd.to_datetime(match.group(1), format='%Y-%m-%d_%H-%M-%S')
+    utc = pd.to_datetime(exported, utc=True).tz_localize(None)
+    # Offsets are whole quarter hours; rounding absorbs the seconds between naming and stamping the export
+    return (local - utc).round('15min')
+
+# Statto encodes missing values as empty objects; turn a relation into a frame with those as None
+def relation_frame(relations, name, columns):
+    records = relations.get(name) or []
+    df = pd.DataFrame.from_records(records)
+    for col in columns:
+        if col not in df.columns:
+            df[col] = None
+    df = df.astype(object).where(df.map(lambda x: not isinstance(x, dict)), None)
+    return df.infer_objects()
+
+# Statto timestamps are UTC ISO strings; the CSV export writes them as "YYYY-MM-DD HH:MM:SS" in the exporting
+# device's local time, so shift by its UTC offset (see export_utc_offset). Without one the values stay in UTC.
+def local_times(created, utc_offset):
+    times = pd.to_datetime(created, utc=True).dt.tz_localize(None)
+    return times + utc_offset if utc_offset is not None else times
+
+def format_created(created, utc_offset):
+    return local_times(created, utc_offset).dt.strftime('%Y-%m-%d %H:%M:%S')
+
+# Flag columns are stored as 0/1 integers in the CSV export
+def as_flag(series):
+    return series.fillna(False).astype(bool).astype(int)
+
+# Game folder key for an archive game, e.g. "2025-07-12 PEC-W Sat Dark Sky"
+def game_keys(games, utc_offset):
+    dates = local_times(games['date'], utc_offset).dt.strftime('%Y-%m-%d')
+    keys = dates + ' ' + games['opponent'].fillna('Unknown')
+    duplicated = keys.duplicated(keep=False)
+    keys[duplicated] = keys[duplicated] + ' ' + games.loc[duplicated, 'uuid'].str[:4]
+    return keys
+
+# Number points within each game and possessions within each point by creation order
+def number_points_and_possessions(games, points, possessions):
+    points = points.merge(games[['uuid', 'game']].rename(columns={'uuid': 'gameUUID'}), on='gameUUID')
+    points = points.sort_values(['game', 'createdAt'], kind='stable')
+    points['Point'] = points.groupby('game').cumcount() + 1
+
+    possessions = possessions.merge(
+        points[['uuid', 'game', 'Point', 'isOffense', 'result']].rename(columns={'uuid': 'pointUUID'}),
+        on='pointUUID'
+    )
+    possessions = possessions.sort_values(['game', 'Point', 'createdAt'], kind='stable')
+    possessions['Possession'] = possessions.groupby(['game', 'Point']).cumcount() + 1
+    return points, possessions
+
+# Passes frame with the same columns and derived flags as the Statto CSV export
+def build_passes(raw_passes, possessions, player_names, huck_distance, utc_offset):
+    passes = raw_passes.merge(
+        possessions[['uuid', 'game', 'Point', 'Possession']].rename(columns={'uuid': 'possessionUUID'}),
+        on='possessionUUID'
+    )
+    passes = passes.sort_values(['game', 'Point', 'Possession', 'createdAt'], kind='stable')
+
+    forward = (passes['startY'] - passes['endY']) * PITCH_LENGTH_M
+    lateral = (passes['startX'] - passes['endX']) * PITCH_WIDTH_M
+    distance = np.hypot(forward, lateral)
+    swing = ((passes['startX'] - passes['endX']).abs() > SWING_MIN_LATERAL_FRACTION) & (forward.abs() <= SWING_MAX_FORWARD_M)
+    thrower_error = as_flag(passes['isThrowerError'])
+    receiver_error = as_flag(passes['isReceiverError'])
+
+    return pd.DataFrame({
+        'game': passes['game'],
+        'Created': format_created(passes['createdAt'], utc_offset),
+        'Point': passes['Point'],
+        'Possession': passes['Possession'],
+        'Thrower': passes['throwerUUID'].map(player_names),
+        'Receiver': passes['receiverUUID'].map(player_names),
+        'Turnover?': thrower_error | receiver_error,
+        'Thrower error?': thrower_error,
+        'Receiver error?': receiver_error,
+        'Throw to endzone?': (passes['endY'] < ENDZONE_FRACTION).astype(int),
+        'Assist?': as_flag(passes['isAssist']),
+        'Secondary assist?': as_flag(passes['isSecondaryAssist']),
+        'Huck?': (distance >= huck_distance).astype(int),
+        'Swing?': swing.astype(int),
+        'Dump?': ((forward < -DUMP_MIN_BACKWARD_M) & ~swing).astype(int),
+        'From sideline?': ((passes['startX'] < SIDELINE_FRACTION) | (passes['startX'] > 1 - SIDELINE_FRACTION)).astype(int),
+        'To sideline?': ((passes['endX'] < SIDELINE_FRACTION) | (passes['endX'] > 1 - SIDELINE_FRACTION)).astype(int),
+        'Distance (m)': distance,
+        'Forward distance (m)': forward,
+        'Left-to-right distance (m)': lateral,
+        START_X: passes['startX'],
+        START_Y: passes['startY'],
+        END_X: passes['endX'],
+        END_Y: passes['endY'],
+        'thrower_uuid': passes['throwerUUID'],
+        'receiver_uuid': passes['receiverUUID'],
+        'possession_uuid': passes['possessionUUID'],
+    })
+
+# Name of the thrower/receiver involved in a flagged pass, one per (game, Point[, Possession])
+def flagged_player(passes, flag, player_col, keys):
+    flagged = passes[passes[flag] == 1]
+    return flagged.groupby(keys)[player_col].last()
+
+# Possessions frame matching the CSV export
+def build_possessions(possessions, passes, stall_outs, player_names, utc_offset):
+    keys = ['game', 'Point', 'Possession']
+    possession_stats = passes.groupby(keys).agg(**{
+        'Passes': ('Created', 'size'),
+        'Scored?': ('Assist?', 'max'),
+    })
+    for column, flag, player_col in [
+        ('Secondary assist', 'Secondary assist?', 'Thrower'),
+        ('Assist', 'Assist?', 'Thrower'),
+        ('Goal', 'Assist?', 'Receiver'),
+        ('Thrower error', 'Thrower error?', 'Thrower'),
+        ('Receiver error', 'Receiver error?', 'Receiver'),
+    ]:
+        possession_stats[column] = flagged_player(passes, flag, player_col, keys)
+    stalled = stall_outs.groupby(keys)['Player'].last().rename('Stalled out')
+    possession_stats = possession_stats.join(stalled)
+
+    df = possessions.merge(possession_stats.reset_index(), on=keys, how='left')
+    df['Passes'] = df['Passes'].fillna(0).astype(int)
+    df['Scored?'] = df['Scored?'].fillna(0).astype(int)
+    df['Created'] = format_created(df['createdAt'], utc_offset)
+    df['Started point on offense?'] = as_flag(df['isOffense'])
+    df[START_X] = df['startX']
+    df[START_Y] = df['startY']
+    df['Initiator'] = df['initiatorUUID'].map(player_names)
+    return df[['game'] + POSSESSIONS_COLUMNS]
+
+# Points frame matching the CSV export, including the score at each pull
+def build_points(points, possessions, passes, blocks, opposition_errors, utc_offset):
+    keys = ['game', 'Point']
+    df = points.copy()
+    df['Created'] = format_created(df['createdAt'], utc_offset)
+    df['Started on offense?'] = as_flag(df['isOffense'])
+    df['Scored?'] = (df['result'] == 1).astype(int)
+    conceded = (df['result'] == -1).astype(int)
+    df['Our score at pull'] = df.groupby('game')['Scored?'].cumsum() - df['Scored?']
+    df["Opponent's score at pull"] = conceded.groupby(df['game']).cumsum() - conceded
+
+    point_stats = pd.DataFrame({
+        'Possessions': possessions.groupby(keys).size(),
+        'Passes': passes.groupby(keys).size(),
+        'Turnovers': passes.groupby(keys)['Turnover?'].sum(),
+        'Thrower errors': passes.groupby(keys)['Thrower error?'].sum(),
+        'Receiver errors': passes.groupby(keys)['Receiver error?'].sum(),
+        'Defensive blocks': blocks.groupby(keys).size(),
+        'Opposition errors': opposition_errors.groupby(keys).size(),
+    })
+    point_stats['Secondary assist'] = flagged_player(passes, 'Secondary assist?', 'Thrower', keys)
+    point_stats['Assist'] = flagged_player(passes, 'Assist?', 'Thrower', keys)
+    point_stats['Goal'] = flagged_player(passes, 'Assist?', 'Receiver', keys)
+
+    df = df.merge(point_stats.reset_index(), on=keys, how='left')
+    count_columns = ['Possessions', 'Passes', 'Turnovers', 'Thrower errors', 'Receiver errors', 'Defensive blocks', 'Opposition errors']
+    df[count_columns] = df[count_columns].fillna(0).astype(int)
+    return df[['game'] + POINTS_COLUMNS]
+
+# Defensive Blocks frame matching the CSV export
+def build_defensive_blocks(blocks, points, player_names, utc_offset):
+    df = blocks.merge(points[['uuid', 'game', 'Point']].rename(columns={'uuid': 'pointUUID'}), on='pointUUID')
+    df = df.sort_values(['game', 'Point', 'createdAt'], kind='stable')
+    return pd.DataFrame({
+        'game': df['game'],
+        'Created': format_created(df['createdAt'], utc_offset),
+        'Point': df['Point'],
+        'Player': df['playerUUID'].map(player_names),
+        'In own endzone?': (df['locationY'] > 1 - ENDZONE_FRACTION).astype(int),
+        "In opponent's endzone?": (df['locationY'] < ENDZONE_FRACTION).astype(int),
+        'Stall out?': as_flag(df['isStallOut']),
+        'Callahan?': as_flag(df['isCallahan']),
+        LOCATION_X: df['locationX'],
+        LOCATION_Y: df['locationY'],
+        'player_uuid': df['playerUUID'],
+    })
+
+# Stall Outs Against frame matching the CSV export
+def build_stall_outs(stall_outs, possessions, player_names, utc_offset):
+    df = stall_outs.merge(
+        possessions[['uuid', 'game', 'Point', 'Possession']].rename(columns={'uuid': 'possessionUUID'}),
+        on='possessionUUID'
+    )
+    return pd.DataFrame({
+        'game': df['game'],
+        'Created': format_created(df['createdAt'], utc_offset),
+        'Point': df['Point'],
+        'Possession': df['Possession'],
+        'Player': df['playerUUID'].map(player_names),
+        LOCATION_X: df['locationX'],
+        LOCATION_Y: df['locationY'],
+        'player_uuid': df['playerUUID'],
+    })
+
+# Player Stats frame matching the CSV export, one row per player per game
+def build_player_stats(points, possessions, passes, blocks, stall_outs, player_names):
+    keys = ['game', 'player_uuid']
+    lineups = points[['game', 'Point', 'isOffense', 'result', 'playerUUIDs']].explode('playerUUIDs')
+    lineups = lineups.dropna(subset=['playerUUIDs']).rename(columns={'playerUUIDs': 'player_uuid'})
+    lineups['offense'] = lineups['isOffense'].astype(bool)
+    lineups['won'] = lineups['result'] == 1
+
+    # A touch is holding the disc: every throw, plus catching a goal or being stalled
+    touched = pd.concat([
+        passes[['game', 'Point', 'thrower_uuid']].rename(columns={'thrower_uuid': 'player_uuid'}),
+        passes.loc[passes['Assist?'] == 1, ['game', 'Point', 'receiver_uuid']].rename(columns={'receiver_uuid': 'player_uuid'}),
+        stall_outs[['game', 'Point', 'player_uuid']],
+    ]).dropna().drop_duplicates()
+
+    lineups = lineups.sort_values(['game', 'Point'])
+    lineups['point_str'] = lineups['Point'].astype(str)
+    stats = lineups.groupby(keys).agg(**{
+        'Points played total': ('Point', 'size'),
+        'Points played': ('point_str', ','.join),
+    })
+    # Counted from the touches themselves, as the export does, even when the lineup misses the player
+    stats['Points played with touches'] = touched.groupby(keys).size()
+    stats['Offense points played'] = lineups[lineups['offense']].groupby(keys).size()
+    stats['Defense points played'] = lineups[~lineups['offense']].groupby(keys).size()
+    stats['Offense points won'] = lineups[lineups['offense'] & lineups['won']].groupby(keys).size()
+    stats['Defense points won'] = lineups[~lineups['offense'] & lineups['won']].groupby(keys).size()
+
+    throws = passes.rename(columns={'thrower_uuid': 'player_uuid'})
+    completed_throws = throws[throws['Turnover?'] == 0]
+    targets = passes.rename(columns={'receiver_uuid': 'player_uuid'})
+    catches = targets[targets['Turnover?'] == 0]
+    initiated = possessions.rename(columns={'initiatorUUID': 'player_uuid'})
+
+    stats['Throws'] = throws.groupby(keys).size()
+    stats['Catches'] = catches.groupby(keys).size()
+    stats['Possessions initiated'] = initiated.groupby(keys).size()
+    stats['Assists'] = throws.groupby(keys)['Assist?'].sum()
+    stats['Secondary assists'] = throws.groupby(keys)['Secondary assist?'].sum()
+    stats['Goals'] = catches.groupby(keys)['Assist?'].sum()
+    stats['Thrower errors'] = throws.groupby(keys)['Thrower error?'].sum()
+    stats['Receiver errors'] = targets.groupby(keys)['Receiver error?'].sum()
+    stats['Defensive blocks'] = blocks.groupby(keys).size()
+    stats['Stall outs for'] = blocks[blocks['Stall out?'] == 1].groupby(keys).size()
+    stats['Stall outs against'] = stall_outs.groupby(keys).size()
+    stats['Total completed throw distance (m)'] = completed_throws.groupby(keys)['Distance (m)'].sum()
+    stats['Total completed throw gain (m)'] = completed_throws.groupby(keys)['Forward distance (m)'].sum()
+    stats['Total caught pass distance (m)'] = catches.groupby(keys)['Distance (m)'].sum()
+    stats['Total caught pass gain (m)'] = catches.groupby(keys)['Forward distance (m)'].sum()
+
+    count_columns = [
+        'Points played with touches', 'Offense points played', 'Defense points played', 'Offense points won', 'Defense points won',
+        'Throws', 'Catches', 'Possessions initiated', 'Assists', 'Secondary assists', 'Goals',
+        'Thrower errors', 'Receiver errors', 'Defensive blocks', 'Stall outs for', 'Stall outs against',
+    ]
+    stats[count_columns] = stats[count_columns].fillna(0).astype(int)
+    distance_columns = [
+        'Total completed throw distance (m)', 'Total completed throw gain (m)',
+        'Total caught pass distance (m)', 'Total caught pass gain (m)',
+    ]
+    stats[distance_columns] = stats[distance_columns].fillna(0.0)
+
+    stats['Touches'] = stats['Throws'] + stats['Goals'] + stats['Stall outs against']
+    stats['Turnovers'] = stats['Thrower errors'] + stats['Receiver errors'] + stats['Stall outs against']
+    completed_throw_count = completed_throws.groupby(keys).size().reindex(stats.index)
+    stats['Average completed throw distance (m)'] = (stats['Total completed throw distance (m)'] / completed_throw_count).fillna(0.0)
+    stats['Average completed throw gain (m)'] = (stats['Total completed throw gain (m)'] / completed_throw_count).fillna(0.0)
+    catch_count = stats['Catches'].where(lambda s: s > 0)
+    stats['Average caught pass distance (m)'] = (stats['Total caught pass distance (m)'] / catch_count).fillna(0.0)
+    stats['Average caught pass gain (m)'] = (stats['Total caught pass gain (m)'] / catch_count).fillna(0.0)
+
+    stats = stats.reset_index()
+    stats['Player'] = stats['player_uuid'].map(player_names)
+    stats = stats.dropna(subset=['Player']).sort_values(['game', 'Points played total', 'Player'], ascending=[True, False, True])
+    return stats[['game'] + PLAYER_STATS_COLUMNS]
+
+# Split a season-wide frame into per-game frames without the helper columns
+def split_by_game(df, games, drop_columns=()):
+    grouped = dict(tuple(df.groupby('game', sort=False)))
+    empty = df.iloc[0:0]
+    return {
+        game: grouped.get(game, empty).drop(columns=['game', *drop_columns], errors='ignore').reset_index(drop=True)
+        for game in games
+    }
+
+# Load a .statto archive into {tournament: {game: {stat file: df}}}, the same shape as load_tournament_csvs.
+# The whole season is built with one set of vectorized merges and then split per game.
+def load_statto_archive(path):
+    export = read_statto_json(path)
+    utc_offset = export_utc_offset(export)
+    data = export['teams'][0]['data']
+    team = data['team']
+    relations = data['relations']
+    tournament = team.get('name') or os.path.splitext(os.path.basename(path))[0]
+
+    games = relation_frame(relations, 'games', ['uuid', 'opponent', 'date', 'createdAt'])
+    players = relation_frame(relations, 'players', ['uuid', 'name', 'number'])
+    points = relation_frame(relations, 'points', ['uuid', 'gameUUID', 'createdAt', 'isOffense', 'result', 'playerUUIDs'])
+    raw_possessions = relation_frame(relations, 'possessions', ['uuid', 'pointUUID', 'createdAt', 'startX', 'startY', 'initiatorUUID'])
+    raw_passes = relation_frame(relations, 'passes', [
+        'uuid', 'possessionUUID', 'createdAt', 'throwerUUID', 'receiverUUID', 'isThrowerError', 'isReceiverError',
+        'isAssist', 'isSecondaryAssist', 'startX', 'startY', 'endX', 'endY',
+    ])
+    raw_blocks = relation_frame(relations, 'defensiveBlocks', ['uuid', 'pointUUID', 'playerUUID', 'createdAt', 'locationX', 'locationY', 'isStallOut', 'isCallahan'])
+    raw_stall_outs = relation_frame(relations, 'stallOutsAgainst', ['uuid', 'possessionUUID', 'playerUUID', 'createdAt', 'locationX', 'locationY'])
+    raw_opposition_errors = relation_frame(relations, 'oppositionErrors', ['uuid', 'pointUUID', 'createdAt'])
+
+    games = games.sort_values('date', kind='stable')
+    games['game'] = game_keys(games, utc_offset)
+    numbers = pd.to_numeric(players['number'], errors='coerce')
+    player_names = (numbers.map(lambda n: f"{int(n):02d} " if pd.notnull(n) else '') + players['name'].fillna('')).set_axis(players['uuid'])
+    huck_distance = team.get('minHuckDistance') or 27
+
+    points, possessions = number_points_and_possessions(games, points, raw_possessions)
+    passes = build_passes(raw_passes, possessions, player_names, huck_distance, utc_offset)
+    blocks = build_defensive_blocks(raw_blocks, points, player_names, utc_offset)
+    stall_outs = build_stall_outs(raw_stall_outs, possessions, player_names, utc_offset)
+    opposition_errors = raw_opposition_errors.merge(points[['uuid', 'game', 'Point']].rename(columns={'uuid': 'pointUUID'}), on='pointUUID')
+    points_df = build_points(points, possessions, passes, blocks, opposition_errors, utc_offset)
+    possessions_df = build_possessions(possessions, passes, stall_outs, player_names, utc_offset)
+    player_stats_df = build_player_stats(points, possessions, passes, blocks, stall_outs, player_names)
+
+    # Passes carry the same Points columns and "tournament_game" label as the CSV loader adds
+    columns_to_merge = ['game', 'Point', 'Our score at pull', "Opponent's score at pull", 'Started on offense?', 'Scored?']
+    passes = passes.merge(points_df[columns_to_merge], on=['game', 'Point'], how='left')
+    passes['tournament_game'] = tournament + '_' + passes['game']
+    passes = add_field_coordinates(passes)
+
+    game_names = list(games['game'])
+    tables = {
+        'Passes': split_by_game(passes, game_names, ['thrower_uuid', 'receiver_uuid', 'possession_uuid']),
+        'Points': split_by_game(points_df, game_names),
+        'Possessions': split_by_game(possessions_df, game_names),
+        'Player Stats': split_by_game(player_stats_df, game_names),
+        'Defensive Blocks': split_by_game(blocks, game_names, ['player_uuid']),
+        'Stall Outs Against': split_by_game(stall_outs, game_names, ['player_uuid']),
+    }
+    tournament_data = {tournament: {}}
+    for game in game_names:
+        tournament_data[tournament][game] = {name: apply_schema(table[game]) for name, table in tables.items()}
+    return tournament_data
@@ -0,0 +1,55 @@
+import streamlit as st
+import pandas as pd
+
+from utils.draw import draw_field
+from utils.perf import perf_phase, record_figure
+from utils.spatial import ZONE_METRICS, ZONE_SIZE, ZONE_SIZES, add_zone_metric
+
+
+ALL_GAMES = "All selected games"
+LINES = {"O and D points": None, "O points": 1, "D points": 0}
+
+
+# Where on the field throws are completed or turned over. options holds the Thrower / Receiver columns of the
+# selected games' passes for the filter lists; zone_stats(games, filters, zone_size, at) returns the zone counts.
+def show_field_zones(selected_games, options, zone_stats):
+    col_select, col_chart = st.columns([1, 2])
+
+    with col_select:
+        metric = st.radio("Metric", list(ZONE_METRICS), index=list(ZONE_METRICS).index("Turnover %"))
+        at = st.radio("Zone by", ["Throw start", "Throw end"], horizontal=True)
+        zone_size = st.select_slider("Zone size (yd)", ZONE_SIZES, value=ZONE_SIZE)
+
+        game_labels = [ALL_GAMES] + [f"{tournament} / {game}" for tournament, game in selected_games]
+        game = st.selectbox("Game", game_labels)
+        games = selected_games if game == ALL_GAMES else [selected_games[game_labels.index(game) - 1]]
+
+        role = st.radio("Player as", ["Thrower", "Receiver"], horizontal=True)
+        players = sorted((x for x in options[role].unique() if pd.notnull(x)), key=str)
+        player = st.selectbox("Player", players, index=None, placeholder="All players")
+        line = st.radio("Points", list(LINES), horizontal=True)
+
+        filters = {}
+        if player is not None:
+            filters[role] = player
+        if LINES[line] is not None:
+            filters['Started on offense?'] = LINES[line]
+
+    with perf_phase('zone stats'):
+        stats = zone_stats(games, filters, zone_size, 'start' if at == "Throw start" else 'end')
+    attempts = int(stats['attempts'].sum())
+
+    with col_select:
+        turnovers = int(stats['turnovers'].sum())
+        st.metric("Throws", attempts)
+        st.metric("Turnovers", f"{turnovers} ({turnovers / attempts * 100:.1f}%)" if attempts else turnovers)
+
+    with col_chart:
+        if not attempts:
+            st.info("No throws match the selected filters")
+            return
+        with perf_phase('build figure', rows=attempts):
+            fig = add_zone_metric(draw_field(), stats, metric)
+        record_figure('field zones', fig)
+        with perf_phase('render figure'):
+            st.plotly_chart(fig, use_container_width=False)
@@ -0,0 +1,129 @@
+import streamlit as st
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from utils.network import player_involvement
+from utils.perf import perf_phase, record_figure
+
+
+EDGE_METRICS = {"Attempts": "attempts", "Completions": "completions", "Yards gained": "yards_gained", "Turnovers": "turnovers"}
+EDGE_WIDTHS = [1, 2.5, 4.5, 7]   # line width per quartile of the edge metric
+CURVE_POINTS = 16                # samples per connection curve
+CURVE_BEND = 0.35                # how far connections bow towards the centre (0 = straight, 1 = through it)
+
+
+# Player positions around a unit circle, in the order given
+def circle_layout(players):
+    angles = np.pi / 2 - 2 * np.pi * np.arange(len(players)) / max(len(players), 1)
+    return pd.DataFrame({'x': np.cos(angles), 'y': np.sin(angles)}, index=pd.Index(players, name='Player'))
+
+# Quadratic curves from thrower to receiver for every connection, vectorized. The control point is pulled towards
+# the centre and pushed to the thrower's right, so A -> B and B -> A bow apart. Returns x and y arrays of shape
+# (connections, CURVE_POINTS).
+def connection_curves(start, end):
+    middle = (start + end) / 2
+    direction = end - start
+    normal = np.column_stack([direction[:, 1], -direction[:, 0]])
+    control = middle * (1 - CURVE_BEND) + normal * 0.08
+    t = np.linspace(0, 1, CURVE_POINTS)[:, None, None]
+    curves = (1 - t) ** 2 * start + 2 * (1 - t) * t * control + t ** 2 * end
+    return curves[:, :, 0].T, curves[:, :, 1].T
+
+# Network of thrower -> receiver connections around a circle. Connections are drawn in one trace per width
+# bucket (None-separated curves) plus one hover trace, so the trace count does not grow with the roster.
+def network_figure(connections, metric):
+    involvement = player_involvement(connections)
+    layout = circle_layout(involvement.index)
+    fig = go.Figure()
+
+    if not connections.empty:
+        start = layout.loc[connections['Thrower']].to_numpy()
+        end = layout.loc[connections['Receiver']].to_numpy()
+        curve_x, curve_y = connection_curves(start, end)
+        values = connections[metric].to_numpy(dtype=float)
+        buckets = np.digitize(values, np.quantile(values, [0.25, 0.5, 0.75])) if len(values) > 3 else np.zeros(len(values), dtype=int)
+        for bucket, width in enumerate(EDGE_WIDTHS):
+            rows = np.flatnonzero(buckets == bucket)
+            if not len(rows):
+                continue
+            gaps = np.full((len(rows), 1), None)
+            fig.add_trace(go.Scatter(
+                x=np.hstack([curve_x[rows], gaps]).ravel(),
+                y=np.hstack([curve_y[rows], gaps]).ravel(),
+                mode='lines',
+                line=dict(color='rgba(31, 119, 180, 0.45)', width=width),
+                hoverinfo='skip',
+                showlegend=False,
+            ))
+        hover = (
+            connections['Thrower'].astype(str) + ' → ' + connections['Receiver'].astype(str)
+            + '<br>Attempts: ' + connections['attempts'].astype(str)
+            + '<br>Completions: ' + connections['completions'].astype(str)
+            + ' (' + connections['Completion %'].astype(str) + '%)'
+            + '<br>Yards gained: ' + connections['yards_gained'].astype(str)
+        )
+        fig.add_trace(go.Scatter(
+            x=curve_x[:, CURVE_POINTS // 2],
+            y=curve_y[:, CURVE_POINTS // 2],
+            mode='markers',
+            marker=dict(size=8, color='rgba(31, 119, 180, 0.15)'),
+            text=hover,
+            hoverinfo='text',
+            showlegend=False,
+        ))
+
+    sizes = 12 + 30 * np.sqrt(involvement / involvement.max()) if len(involvement) else []
+    fig.add_trace(go.Scatter(
+        x=layout['x'] * 1.12,
+        y=layout['y'] * 1.12,
+        mode='markers+text',
+        marker=dict(size=sizes, color='orange', line=dict(width=1, color='black')),
+        text=layout.index.astype(str),
+        textposition='middle center',
+        textfont=dict(size=10),
+        hovertext=[f"{player}<br>Throws + catch attempts: {count}" for player, count in involvement.items()],
+        hoverinfo='text',
+        showlegend=False,
+    ))
+    fig.update_layout(
+        width=800,
+        height=800,
+        xaxis=dict(visible=False, range=[-1.45, 1.45]),
+        yaxis=dict(visible=False, range=[-1.45, 1.45], scaleanchor='x'),
+        plot_bgcolor='white',
+        margin=dict(l=10, r=10, t=10, b=10),
+    )
+    return fig
+
+# Pass network for the selected games: who connects with whom, as a graph and a sortable connection table
+def show_pass_network(connections):
+    col_select, col_chart = st.columns([1, 4])
+
+    with col_select:
+        metric_label = st.radio("Line width", list(EDGE_METRICS))
+        max_attempts = int(connections['attempts'].max()) if not connections.empty else 1
+        min_attempts = st.slider("Minimum attempts", 1, max(max_attempts, 2), min(3, max_attempts))
+        shown = connections[connections['attempts'] >= min_attempts]
+        st.caption(f"{len(shown)} of {len(connections)} connections")
+
+    with col_chart, perf_phase('build figure', rows=len(shown)):
+        fig = network_figure(shown, EDGE_METRICS[metric_label])
+    with col_chart:
+        record_figure('pass network', fig)
+        with perf_phase('render figure'):
+            st.plotly_chart(fig, use_container_width=False)
+
+    st.markdown("#### Connections")
+    st.caption(
+        "Turnovers: throws to that receiver that were not completed (thrower errors and drops). "
+        "Thrower throwaways: the thrower's turnovers with no receiver, which are part of no connection."
+    )
+    table = shown.rename(columns={
+        'attempts': 'Attempts',
+        'completions': 'Completions',
+        'turnovers': 'Turnovers',
+        'thrower_throwaways': 'Thrower throwaways',
+        'yards_gained': 'Yards gained',
+    })
+    st.dataframe(table, width="content", hide_index=True)